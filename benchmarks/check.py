@@ -0,0 +1,211 @@
+"""
+Checks that the fast paths of the pipeline agree with their references
+
+    python benchmarks/check.py [--check series|sampling|format|server] [--update]
+
+series    the fft and dft backends against the loop backend, also with more harmonics than points
+sampling  the vectorized determine_points against svg.path's Path.point
+format    the output of draw_result for fixed coefficients byte for byte against benchmarks/expected,
+          --update rewrites the expected files after an intended change of the output
+server    a render server on a free port of localhost: a rendering, the error statuses and /status
+
+The exit code is 1 if a check fails.
+"""
+import argparse
+import http.client
+import io
+import json
+import math
+import os
+import signal
+import subprocess
+import sys
+
+src = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src'))
+sys.path.insert(0, src)
+
+from fourier.svg_processor import SvgPath, draw_result  # noqa: E402
+
+expected = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'expected')
+
+checks = ('series', 'sampling', 'format', 'server')
+
+# paths covering every segment kind, relative commands, exponents and closed subpaths
+paths = ('M 10 10 L 90 20 L 40 80 Z',
+         'M 0 0 Q 50 -40 100 0 T 200 0',
+         'M 0 0 C 20 -60 80 60 100 0 S 180 -60 200 0',
+         'M 10 50 A 40 25 30 1 0 90 50 A 40 25 30 0 1 10 50',
+         'm 5e1 1.5e1 h 30 v 2e1 l -15 15 c -5 0 -10 -5 -15 -10 z')
+
+drawing = 'M 20 20 L 180 20 Q 200 50 180 80 L 20 80 C 0 80 0 20 20 20 Z'
+
+
+def check_series() -> list:
+    """
+    Compares the coefficients of the fft and dft backends to the loop backend
+    """
+    import numpy as np
+
+    from fourier.cli import fourier_series
+
+    rng = np.random.default_rng(1)
+    failures = []
+    for number_of_points in (64, 75):
+        points = list(rng.normal(size=number_of_points) + 1j * rng.normal(size=number_of_points))
+        for number_of_harmonics in (1, 10, 64, 151):
+            reference = fourier_series(points, number_of_harmonics, backend='loop')
+            scale = max(1.0, max(abs(c) for c in reference.values()))
+            for backend in ('fft', 'dft'):
+                coefficients = fourier_series(points, number_of_harmonics, backend=backend)
+                if sorted(coefficients) != sorted(reference):
+                    failures.append('%s with %d points and %d harmonics returns other frequencies'
+                                    % (backend, number_of_points, number_of_harmonics))
+                    continue
+                error = max(abs(coefficients[f] - reference[f]) for f in reference) / scale
+                if error > 1e-12:
+                    failures.append('%s with %d points and %d harmonics differs by %.3g'
+                                    % (backend, number_of_points, number_of_harmonics, error))
+    return failures
+
+
+def check_sampling() -> list:
+    """
+    Compares determine_points to svg.path evaluating every point on its own
+    """
+    from svg.path import parse_path
+
+    from fourier.svg_processor import determine_points
+
+    failures = []
+    number_of_points = 200
+    for path_desc in paths:
+        path = parse_path(path_desc)
+        reference = [path.point(i / number_of_points) for i in range(number_of_points)]
+        points = determine_points(path_desc, number_of_points).tolist()
+        extent = max(max(p.real for p in reference) - min(p.real for p in reference),
+                     max(p.imag for p in reference) - min(p.imag for p in reference))
+        error = max(abs(p - q) for p, q in zip(points, reference)) / extent
+        if len(points) != number_of_points or error > 1e-6:
+            failures.append('%s: %d points, relative distance %.3g' % (path_desc, len(points), error))
+    return failures
+
+
+def format_cases():
+    """
+    Yields (name, output) of draw_result for coefficients that do not depend on numpy
+    """
+    svg = SvgPath.from_paths(200, 100, [drawing, 'M 60 40 L 140 40'], [None, (1, 0, 0, 1, 0, 10)])
+    harmonics = {0: complex(100, 50)}
+    for k in range(1, 6):
+        harmonics[k] = complex(30 * math.cos(k), 20 * math.sin(2 * k)) / k
+        harmonics[-k] = complex(10 * math.sin(k), -15 * math.cos(3 * k)) / k
+    line = {0: complex(100, 50), -1: 40j, 1: complex(-40, 0)}
+
+    for layout in ('nested', 'shared'):
+        yield layout, draw_result(svg, [harmonics, line], layout=layout)
+        yield layout + '_digits4', draw_result(svg, [harmonics, line], layout=layout, digits=4)
+        yield layout + '_decimals2_top3', draw_result(svg, [harmonics, line], layout=layout, decimals=2, top_k=3)
+
+        out = io.StringIO()
+        draw_result(svg, [harmonics, line], out=out, layout=layout)
+        yield layout + '_stream', out.getvalue()
+
+
+def check_format(update: bool) -> list:
+    """
+    Compares the output of draw_result to the expected files, or rewrites them
+    """
+    failures = []
+    os.makedirs(expected, exist_ok=True)
+    for name, output in format_cases():
+        file_path = os.path.join(expected, name + '.svg')
+        if update:
+            with open(file_path, 'w', newline='') as fd:
+                fd.write(output)
+            continue
+        try:
+            with open(file_path, 'r', newline='') as fd:
+                reference = fd.read()
+        except FileNotFoundError:
+            failures.append(name + ': ' + file_path + ' is missing, run with --update')
+            continue
+        if output != reference:
+            position = next((i for i, (a, b) in enumerate(zip(output, reference)) if a != b),
+                            min(len(output), len(reference)))
+            failures.append('%s differs from %s at character %d' % (name, file_path, position))
+    return failures
+
+
+def check_server() -> list:
+    """
+    Starts a render server on a free port and sends it a valid and some invalid requests
+    """
+    process = subprocess.Popen([sys.executable, '-m', 'fourier.server', '--port', '0', '--workers', '1'], cwd=src,
+                               stdout=subprocess.PIPE, universal_newlines=True)
+    try:
+        line = process.stdout.readline()
+        if not line.startswith('listening on '):
+            return ['server did not start: ' + repr(line)]
+        port = int(line.rsplit(':', 1)[1])
+
+        def request(method: str, target: str, body: dict = None):
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+            try:
+                connection.request(method, target, body=json.dumps(body) if body is not None else None)
+                response = connection.getresponse()
+                return response.status, response.read().decode('utf-8')
+            finally:
+                connection.close()
+
+        svg = '<svg width="200" height="100" xmlns="http://www.w3.org/2000/svg"><path d="' + drawing + '"/></svg>'
+        failures = []
+        status, body = request('POST', '/render', {'svg': svg, 'harmonics': 10})
+        if status != 200 or not body.startswith('<svg') or 'animateMotion' not in body:
+            failures.append('rendering: %d %s' % (status, body[:200]))
+        for name, fields in (('malformed svg', {'svg': '<svg'}),
+                             ('negative top_k', {'svg': svg, 'top_k': -3}),
+                             ('negative harmonics', {'svg': svg, 'harmonics': -1}),
+                             ('unknown parameter', {'svg': svg, 'colour': 'red'})):
+            status, body = request('POST', '/render', fields)
+            if status != 400:
+                failures.append('%s: expected 400, got %d %s' % (name, status, body[:200]))
+        status, body = request('GET', '/status')
+        if status != 200 or not isinstance(json.loads(body), dict):
+            failures.append('status: %d %s' % (status, body[:200]))
+        return failures
+    finally:
+        process.send_signal(signal.SIGINT)
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='check')
+    parser.add_argument('--check', action='append', choices=checks, help='only run the given checks, can be repeated')
+    parser.add_argument('--update', action='store_true', help='rewrite the expected output of the format check')
+    args = parser.parse_args()
+
+    failed = 0
+    for name in checks:
+        if args.check is not None and name not in args.check:
+            continue
+        try:
+            if name == 'format':
+                failures = check_format(args.update)
+            else:
+                failures = globals()['check_' + name]()
+        except Exception as e:
+            failures = [type(e).__name__ + ': ' + str(e)]
+        print('%-6s %s' % ('ok' if len(failures) == 0 else 'FAILED', name))
+        for failure in failures:
+            print('       ' + failure)
+        sys.stdout.flush()
+        failed += len(failures) != 0
+    sys.exit(1 if failed != 0 else 0)
+
+
+if __name__ == '__main__':
+    main()
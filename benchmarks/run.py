@@ -0,0 +1,261 @@
+"""
+Benchmarks of the stages of the pipeline: parse -> sample -> transform -> render
+
+    python benchmarks/run.py [--quick] [--output results.json] [--baseline baseline.json]
+
+Every case is timed (best of --repeat runs) and run once more under tracemalloc for the peak memory. Results are
+written as JSON. Given a baseline, cases that got slower or need more memory than --threshold times the baseline
+are reported and the exit code is 1.
+"""
+import argparse
+import glob
+import gzip
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+src = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src')
+sys.path.insert(0, os.path.normpath(src))
+
+from fourier.cli import fourier_series  # noqa: E402
+from fourier.svg_processor import SvgPath, determine_points, draw_result  # noqa: E402
+from fourier.svg_visitor.svg_visitor import NumberFormat, Path  # noqa: E402
+
+pictures = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'Pictures')
+
+full_segments = (100, 1000, 10000, 100000)
+full_harmonics = (10, 100, 1000, 10000)
+full_vertices = (10000, 100000)
+quick_segments = (100, 1000)
+quick_harmonics = (10, 100)
+quick_vertices = (10000,)
+number_of_points = 20000
+
+
+def synthetic_path(number_of_segments: int, seed: int = 0) -> str:
+    """
+    Creates a closed path around a circle with a random mix of lines, quadratic and cubic beziers and arcs
+    @param number_of_segments: number of segments of the path
+    @param seed: seed of the random generator
+    @return: path description
+    """
+    rng = np.random.default_rng(seed)
+    angles = np.linspace(0, 2 * np.pi, number_of_segments + 1)
+    radii = 200 + 40 * rng.random(number_of_segments + 1)
+    radii[-1] = radii[0]
+    xs = (250 + radii * np.cos(angles)).tolist()
+    ys = (250 + radii * np.sin(angles)).tolist()
+    kinds = rng.integers(0, 4, number_of_segments).tolist()
+    jitter = (20 * (rng.random((number_of_segments, 4)) - 0.5)).tolist()
+
+    d = ['M %r %r' % (xs[0], ys[0])]
+    for i in range(number_of_segments):
+        x0, y0, x1, y1 = xs[i], ys[i], xs[i + 1], ys[i + 1]
+        mx, my = (x0 + x1) / 2, (y0 + y1) / 2
+        if kinds[i] == 0:
+            d.append('L %r %r' % (x1, y1))
+        elif kinds[i] == 1:
+            d.append('Q %r %r %r %r' % (mx + jitter[i][0], my + jitter[i][1], x1, y1))
+        elif kinds[i] == 2:
+            d.append('C %r %r %r %r %r %r' % (x0 + jitter[i][0], y0 + jitter[i][1], x1 + jitter[i][2],
+                                               y1 + jitter[i][3], x1, y1))
+        else:
+            radius = max(float(np.hypot(x1 - x0, y1 - y0)), 1e-3)
+            d.append('A %r %r 0 0 1 %r %r' % (radius, radius, x1, y1))
+    d.append('Z')
+    return ' '.join(d)
+
+
+def write_svg(directory: str, name: str, path_desc: str) -> str:
+    file_path = os.path.join(directory, name + '.svg')
+    with open(file_path, 'w') as fd:
+        fd.write('<svg width="500" height="500" xmlns="http://www.w3.org/2000/svg">\n')
+        fd.write('  <path stroke="#000" fill="none" d="' + path_desc + '"/>\n')
+        fd.write('</svg>\n')
+    return file_path
+
+
+def render(svg: SvgPath, coefficients: dict, digits: int = None, compress: bool = False, layout: str = 'nested') -> int:
+    """
+    Renders into memory like fourier.render does into a file
+    @return: number of bytes of the output
+    """
+    buffer = io.BytesIO()
+    raw = gzip.GzipFile(fileobj=buffer, mode='wb') if compress else buffer
+    fd = io.TextIOWrapper(raw, encoding='utf-8')
+    draw_result(svg, coefficients, out=fd, digits=digits, layout=layout)
+    fd.flush()
+    if compress:
+        raw.close()
+    return len(buffer.getvalue())
+
+
+def format_polyline(points: np.ndarray, digits: int = None) -> int:
+    """
+    Builds a path through points and formats its d attribute
+    @return: number of characters of the d attribute
+    """
+    return len(Path.polyline(points).format_commands(NumberFormat(digits)))
+
+
+def cases(directory: str, segments: tuple, harmonics: tuple, vertices: tuple):
+    """
+    Yields (stage, name, parameters, function) for every benchmark case
+    """
+    inputs = {}
+    for file_path in sorted(glob.glob(os.path.join(pictures, '*.svg'))):
+        inputs[os.path.splitext(os.path.basename(file_path))[0]] = file_path
+    for count in segments:
+        inputs['synthetic%d' % count] = write_svg(directory, 'synthetic%d' % count, synthetic_path(count))
+
+    for name, file_path in inputs.items():
+        yield 'parse', name, {}, lambda file_path=file_path: SvgPath(file_path)
+
+    svgs = {name: SvgPath(file_path) for name, file_path in inputs.items()}
+    for name, svg in svgs.items():
+        for sampling in ('parameter', 'arclength'):
+            yield 'sample', name, {'points': number_of_points, 'sampling': sampling}, \
+                lambda svg=svg, sampling=sampling: determine_points(svg.path, number_of_points, sampling=sampling)
+        yield 'sample', name, {'points': 'auto', 'harmonics': 100}, \
+            lambda svg=svg: determine_points(svg.path, None, number_of_harmonics=100)
+
+    points = determine_points(svgs['bird'].path, number_of_points)
+    for count in harmonics:
+        yield 'transform', 'bird', {'harmonics': count, 'backend': 'fft'}, \
+            lambda count=count: fourier_series(points, count, backend='fft')
+        if count <= 100:
+            yield 'transform', 'bird', {'harmonics': count, 'backend': 'dft'}, \
+                lambda count=count: fourier_series(points, count, backend='dft')
+
+    for count in harmonics:
+        coefficients = fourier_series(points, count)
+        yield 'render', 'bird', {'harmonics': count}, \
+            lambda coefficients=coefficients: render(svgs['bird'], coefficients)
+        yield 'render', 'bird', {'harmonics': count, 'digits': 6}, \
+            lambda coefficients=coefficients: render(svgs['bird'], coefficients, digits=6)
+        yield 'render', 'bird', {'harmonics': count, 'digits': 6, 'compress': True}, \
+            lambda coefficients=coefficients: render(svgs['bird'], coefficients, digits=6, compress=True)
+        yield 'render', 'bird', {'harmonics': count, 'layout': 'shared'}, \
+            lambda coefficients=coefficients: render(svgs['bird'], coefficients, layout='shared')
+
+    for count in vertices:
+        trajectory = np.exp(2j * np.pi * np.arange(count) / count) * (200 + 20 * np.sin(np.arange(count)))
+        yield 'render', 'polyline', {'vertices': count}, lambda trajectory=trajectory: format_polyline(trajectory)
+        yield 'render', 'polyline', {'vertices': count, 'digits': 6}, \
+            lambda trajectory=trajectory: format_polyline(trajectory, digits=6)
+
+
+def measure(function, repeat: int) -> dict:
+    """
+    Runs a case repeat times for the best wall time and once under tracemalloc for the peak memory
+    Cases returning a number of bytes additionally record it as output size
+    """
+    try:
+        wall = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            output_bytes = function()
+            wall = min(wall, time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            function()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    except Exception as e:
+        return {'error': type(e).__name__ + ': ' + str(e)}
+    if isinstance(output_bytes, int):
+        return {'wall': wall, 'peak_bytes': peak, 'output_bytes': output_bytes}
+    return {'wall': wall, 'peak_bytes': peak}
+
+
+def case_key(result: dict) -> str:
+    parameters = ','.join('%s=%s' % item for item in sorted(result['parameters'].items()))
+    return result['stage'] + '/' + result['name'] + '[' + parameters + ']'
+
+
+def compare(results: list, baseline: list, threshold: float, min_wall: float) -> int:
+    """
+    Prints every case that got worse than threshold times the baseline
+    Wall times below min_wall in both runs are considered noise
+    @return: number of regressions
+    """
+    previous = {case_key(result): result for result in baseline}
+    regressions = 0
+    for result in results:
+        old = previous.get(case_key(result))
+        if old is None:
+            continue
+        if 'error' in result and 'error' not in old:
+            print('REGRESSION %s: %s' % (case_key(result), result['error']))
+            regressions += 1
+            continue
+        if 'error' in result or 'error' in old:
+            continue
+        for metric in ('wall', 'peak_bytes', 'output_bytes'):
+            if metric not in result or metric not in old:
+                continue
+            if metric == 'wall' and max(old[metric], result[metric]) < min_wall:
+                continue
+            if old[metric] > 0 and result[metric] / old[metric] > threshold:
+                print('REGRESSION %s: %s %.4g -> %.4g (x%.2f)' % (case_key(result), metric, old[metric],
+                                                                 result[metric], result[metric] / old[metric]))
+                regressions += 1
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='benchmarks')
+    parser.add_argument('--quick', action='store_true', help='only run the small cases')
+    parser.add_argument('--stage', action='append', choices=('parse', 'sample', 'transform', 'render'),
+                        help='only run the given stages, can be repeated')
+    parser.add_argument('--repeat', type=int, default=3, help='number of timed runs per case (default: 3)')
+    parser.add_argument('--output', default='benchmark_results.json', help='file to write the results to')
+    parser.add_argument('--baseline', help='results of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='ratio to the baseline that counts as regression (default: 1.25)')
+    parser.add_argument('--min-wall', type=float, default=0.005,
+                        help='wall times below this many seconds are not compared (default: 0.005)')
+    args = parser.parse_args()
+
+    segments = quick_segments if args.quick else full_segments
+    harmonics = quick_harmonics if args.quick else full_harmonics
+    vertices = quick_vertices if args.quick else full_vertices
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        for stage, name, parameters, function in cases(directory, segments, harmonics, vertices):
+            if args.stage is not None and stage not in args.stage:
+                continue
+            result = {'stage': stage, 'name': name, 'parameters': parameters}
+            result.update(measure(function, args.repeat))
+            results.append(result)
+            if 'error' in result:
+                print('%-60s %s' % (case_key(result), result['error']))
+            else:
+                line = '%-60s %10.4fs %10.1f KiB' % (case_key(result), result['wall'], result['peak_bytes'] / 1024)
+                if 'output_bytes' in result:
+                    line += ' %10.1f KiB output' % (result['output_bytes'] / 1024)
+                print(line)
+            sys.stdout.flush()
+
+    with open(args.output, 'w') as fd:
+        json.dump({'python': platform.python_version(), 'numpy': np.__version__, 'results': results}, fd, indent=1)
+
+    if args.baseline is not None:
+        with open(args.baseline, 'r') as fd:
+            baseline = json.load(fd)['results']
+        if compare(results, baseline, args.threshold, args.min_wall) != 0:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+"""
+Startup time of the entry points, measured with python -X importtime
+
+    python benchmarks/startup.py [--budget 150] [--repeat 5]
+
+Every entry point module is imported in a fresh interpreter. The best cumulative import time over --repeat runs has
+to stay within --budget milliseconds, and none of the heavy modules (numpy, svg.path, PIL) may be imported before the
+first stage that needs them. The exit code is 1 if a module breaks either rule.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+src = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'src'))
+
+entry_points = ('fourier.cli', 'fourier.batch', 'fourier.raster', 'fourier.render_coefficients', 'fourier.server')
+heavy_modules = ('numpy', 'svg.path', 'PIL')
+
+
+def import_times(module: str) -> dict:
+    """
+    Imports a module in a fresh interpreter
+    @return: cumulative import time in microseconds of every module that was imported
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module], cwd=src,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='startup')
+    parser.add_argument('--budget', type=float, default=150,
+                        help='maximum import time of every entry point in milliseconds (default: 150)')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs per entry point (default: 5)')
+    args = parser.parse_args()
+
+    failed = 0
+    for module in entry_points:
+        runs = [import_times(module) for _ in range(args.repeat)]
+        best = min(run[module] for run in runs) / 1000
+        heavy = sorted(name for name in runs[0] if name.split('.')[0] in heavy_modules or name in heavy_modules)
+        slowest = sorted(((time, name) for name, time in runs[0].items() if name != module), reverse=True)[:3]
+
+        status = 'ok'
+        if best > args.budget or len(heavy) != 0:
+            status = 'FAILED'
+            failed += 1
+        print('%-6s %-28s %8.1f ms  slowest: %s' % (status, module, best,
+                                                    ', '.join('%s %.1f ms' % (name, time / 1000)
+                                                              for time, name in slowest)))
+        if len(heavy) != 0:
+            print('       imports ' + ', '.join(heavy) + ' at startup')
+    sys.exit(1 if failed != 0 else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,6 @@
+"""
+Animates svg drawings with the epicycles of their fourier series
+
+The command line programs are fourier.cli, fourier.batch, fourier.raster, fourier.render_coefficients and
+fourier.server. Importing the package loads nothing else, numpy and svg.path are imported by the stages that need them
+"""
@@ -0,0 +1,217 @@
+import argparse
+import csv
+import glob
+import json
+import os
+import sys
+import time
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, NamedTuple, Optional
+
+from fourier.cli import auto_argument, backends, positive_argument, render
+from fourier.coefficient_cache import CoefficientCache
+from fourier.svg_processor import samplings
+
+
+class Job(NamedTuple):
+    input_file: str
+    output_file: str
+    number_of_harmonics: Optional[int]
+    number_of_points: Optional[int]
+    # set for manifest rows that cannot be run, they are reported as failed without being rendered
+    error: Optional[str] = None
+
+
+class Options(NamedTuple):
+    sampling: str
+    backend: str
+    cache_dir: Optional[str]
+    cache_size: int
+    max_paths: Optional[int] = None
+
+
+def jobs_from_glob(pattern: str, output_dir: Optional[str], number_of_harmonics: Optional[int],
+                   number_of_points: Optional[int]) -> List[Job]:
+    """
+    Creates one job per svg file matching a glob pattern or contained in a directory
+    The output is written next to the input as <name>_animated.svg, or into output_dir if given
+    @param pattern: directory or glob pattern
+    @param output_dir: optional directory for the results
+    @param number_of_harmonics: Number of frequencies to draw, None selects it per path
+    @param number_of_points: Number of points sampled from each path, None chooses it per path
+    @return: list of jobs
+    """
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, '*.svg')
+
+    jobs = []
+    for input_file in sorted(glob.glob(pattern)):
+        name, _ = os.path.splitext(os.path.basename(input_file))
+        if name.endswith('_animated'):
+            continue
+        directory = output_dir if output_dir is not None else os.path.dirname(input_file)
+        jobs.append(Job(input_file, os.path.join(directory, name + '_animated.svg'), number_of_harmonics,
+                        number_of_points))
+    return jobs
+
+
+def jobs_from_manifest(manifest: str, number_of_harmonics: Optional[int],
+                       number_of_points: Optional[int]) -> List[Job]:
+    """
+    Reads jobs from a JSONL or CSV manifest with the fields input, output, harmonics and points
+    harmonics and points are optional and default to the given values, both may be "auto". A row that cannot be read
+    becomes a job carrying the error, so that it is reported like a failing file instead of aborting the batch
+    @param manifest: path of a .jsonl or .csv file
+    @param number_of_harmonics: default number of frequencies, None selects it per path
+    @param number_of_points: default number of points, None chooses it per path
+    @return: list of jobs
+    """
+    with open(manifest, 'r', newline='') as fd:
+        if manifest.endswith('.csv'):
+            # line 1 is the header
+            rows = [(number + 2, record) for number, record in enumerate(csv.DictReader(fd))]
+        else:
+            rows = [(number + 1, line) for number, line in enumerate(fd) if line.strip()]
+
+    jobs = []
+    for number, record in rows:
+        input_file = manifest + ':' + str(number)
+        try:
+            if not isinstance(record, dict):
+                record = json.loads(record)
+                if not isinstance(record, dict):
+                    raise ValueError('expected a json object')
+            input_file = record.get('input') or input_file
+            for field in ('input', 'output'):
+                if not isinstance(record.get(field), str) or record[field] == '':
+                    raise ValueError('missing field ' + field)
+            jobs.append(Job(record['input'], record['output'],
+                            _manifest_number(record, 'harmonics', number_of_harmonics, 0),
+                            _manifest_number(record, 'points', number_of_points, 1)))
+        except ValueError as e:
+            jobs.append(Job(str(input_file), '', number_of_harmonics, number_of_points,
+                            error='row ' + str(number) + ' of ' + manifest + ': ' + str(e)))
+    return jobs
+
+
+def _manifest_number(record: dict, field: str, default: Optional[int], minimum: int) -> Optional[int]:
+    """
+    Reads an optional number of a manifest row, missing and empty values give the default and "auto" gives None
+    """
+    value = record.get(field)
+    if value is None or value == '':
+        return default
+    if value == 'auto':
+        return None
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError('invalid ' + field + ' ' + repr(value))
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError('invalid ' + field + ' ' + repr(value))
+    if number < minimum:
+        raise ValueError(field + ' has to be at least ' + str(minimum) + ', got ' + str(number))
+    return number
+
+
+def run_job(job: Job, options: Options):
+    """
+    Renders one job, errors are returned instead of raised so that one broken file does not abort the batch
+    @return: (job, error message or None, wall time in seconds)
+    """
+    start = time.perf_counter()
+    try:
+        cache = None
+        if options.cache_dir is not None:
+            cache = CoefficientCache(options.cache_dir, options.cache_size)
+        # automatic harmonics keep the same energy as the default of fourier
+        render(job.input_file, job.output_file, job.number_of_harmonics, number_of_points=job.number_of_points,
+               sampling=options.sampling, backend=options.backend, cache=cache,
+               energy=0.999 if job.number_of_harmonics is None else None, max_paths=options.max_paths)
+        error = None
+    except Exception as e:
+        error = type(e).__name__ + ': ' + str(e)
+    return job, error, time.perf_counter() - start
+
+
+def run_batch(jobs: List[Job], options: Options, workers: Optional[int] = None) -> int:
+    """
+    Runs all jobs on a process pool and reports the status of every file as soon as it is done
+    @param jobs: jobs to run
+    @param options: options shared by all jobs
+    @param workers: number of worker processes, defaults to the number of cpus
+    @return: number of failed jobs
+    """
+    failed = 0
+    start = time.perf_counter()
+
+    def report(job: Job, error: Optional[str], seconds: float):
+        nonlocal failed
+        if error is None:
+            print('ok     %8.3fs  %s -> %s' % (seconds, job.input_file, job.output_file))
+        else:
+            failed += 1
+            print('FAILED %8.3fs  %s: %s' % (seconds, job.input_file, error))
+        sys.stdout.flush()
+
+    # rows of the manifest that cannot be run fail right away
+    for job in jobs:
+        if job.error is not None:
+            report(job, job.error, 0.0)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_job, job, options): job for job in jobs if job.error is None}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                # the worker itself died, e.g. killed by the os
+                result = futures[future], repr(e), float('nan')
+            report(*result)
+
+    print('%d of %d files done in %.3fs, %d failed' % (len(jobs) - failed, len(jobs), time.perf_counter() - start,
+                                                      failed))
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='fourier-batch',
+                                     description='Renders many drawings on a process pool. The source is either a '
+                                                 'directory, a glob pattern or a .jsonl/.csv manifest with the '
+                                                 'fields input, output, harmonics and points')
+    parser.add_argument('source')
+    parser.add_argument('--output-dir', help='directory for the results of a directory or glob source')
+    parser.add_argument('--harmonics', type=auto_argument, default=100,
+                        help='number of harmonics if not given by the manifest, or "auto" to select it per path '
+                             '(default: 100)')
+    parser.add_argument('--points', type=auto_argument, default=None,
+                        help='number of points if not given by the manifest, or "auto" to choose it per path '
+                             '(default: auto)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes (default: number of cpus)')
+    parser.add_argument('--backend', choices=backends, default='fft',
+                        help='method used to calculate the fourier coefficients (default: fft)')
+    parser.add_argument('--sampling', choices=samplings, default='parameter',
+                        help='spacing of the sampled points along the path (default: parameter)')
+    parser.add_argument('--cache-dir', help='directory to cache spectra in')
+    parser.add_argument('--cache-size', type=float, default=512,
+                        help='maximum size of the cache directory in MiB (default: 512)')
+    parser.add_argument('--max-paths', type=positive_argument, default=None,
+                        help='only animate the first MAX_PATHS paths of every drawing, the rest is not read')
+    args = parser.parse_args()
+
+    if args.source.endswith('.jsonl') or args.source.endswith('.csv'):
+        jobs = jobs_from_manifest(args.source, args.harmonics, args.points)
+    else:
+        jobs = jobs_from_glob(args.source, args.output_dir, args.harmonics, args.points)
+
+    if args.output_dir is not None:
+        os.makedirs(args.output_dir, exist_ok=True)
+
+    options = Options(args.sampling, args.backend, args.cache_dir, int(args.cache_size * 2 ** 20), args.max_paths)
+    sys.exit(1 if run_batch(jobs, options, args.workers) != 0 else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,523 @@
+from __future__ import annotations
+
+from math import pi, sin, cos
+
+import argparse
+import gzip
+import json
+import os
+import tracemalloc
+
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from fourier.coefficient_cache import CoefficientCache
+from fourier.coefficient_file import dtypes, save_coefficients
+from fourier.instrumentation import Stats, note, report, stage
+from fourier.svg_processor import SvgPath, Transform, determine_points, draw_result, layouts, samplings
+
+if TYPE_CHECKING:
+    import numpy as np
+
+backends = ('loop', 'fft', 'dft')
+
+
+def fourier_series(points: list, number_of_harmonics: int, backend: str = 'fft') -> Dict[int, complex]:
+    """
+    Performs the analysis of a discrete fourier series
+    Calculates the complex fourier series coefficients, most likely called c_n
+    The indices of the coefficients are symmetric to 0
+    @param points: List of Points to consider
+    @param number_of_harmonics: Number of frequencies to calculate
+    @param backend: 'loop' (pure python reference), 'fft' (one numpy fft over all points)
+                    or 'dft' (vectorized direct transform, cheap for a small number of harmonics)
+    @return: Dict containing values of the frequencies
+    """
+    if backend == 'loop':
+        return __fourier_series_loop(points, number_of_harmonics)
+    if backend == 'fft':
+        return __fourier_series_fft(points, number_of_harmonics)
+    if backend == 'dft':
+        return __fourier_series_dft(points, number_of_harmonics)
+    raise ValueError('unknown backend "' + str(backend) + '", expected one of ' + ', '.join(backends))
+
+
+def __fourier_series_loop(points: list, number_of_harmonics: int) -> Dict[int, complex]:
+    """
+    Reference implementation, evaluates every coefficient with explicit loops over all points
+    @param points: List of Points to consider
+    @param number_of_harmonics: Number of frequencies to calculate
+    @return: Dict containing values of the frequencies
+    """
+    period = len(points)
+    end = number_of_harmonics // 2
+
+    c_ret = {}
+
+    c_0 = 0.0 + 0.0j
+    for j in range(period):
+        c_0 += points[j] / period
+
+    for i in range(-end, end + 1):
+        if i == 0:
+            c_ret[0] = c_0
+        else:
+            a_i = 0.0 + 0.0j
+            for j in range(period):
+                a_i += 2 * (points[j] / period) * cos(2 * pi / period * i * j)
+            b_i = 0.0 + 0.0j
+            for j in range(period):
+                b_i += 2 * (points[j] / period) * sin(2 * pi / period * i * j)
+            c_ret[i] = (a_i - 0.0 + 1.0j * b_i) / 2
+
+    return c_ret
+
+
+def __fourier_series_fft(points: list, number_of_harmonics: int) -> Dict[int, complex]:
+    """
+    Calculates all coefficients with a single fft
+    @param points: List of Points to consider
+    @param number_of_harmonics: Number of frequencies to calculate
+    @return: Dict containing values of the frequencies
+    """
+    return coefficients_from_spectrum(fourier_spectrum(points), number_of_harmonics)
+
+
+def fourier_spectrum(points: list) -> np.ndarray:
+    """
+    Calculates the full spectrum of the points
+    c_n = 1/N * sum(x_j * e^(2*pi*i*n*j/N)) is exactly the inverse discrete fourier transform at index n mod N
+    @param points: List of Points to consider
+    @return: array of length N containing c_n at index n mod N
+    """
+    import numpy as np
+
+    return np.fft.ifft(np.asarray(points, dtype=np.complex128))
+
+
+def coefficients_from_spectrum(spectrum: np.ndarray, number_of_harmonics: int) -> Dict[int, complex]:
+    """
+    Picks the coefficients symmetric to 0 out of a full spectrum
+    @param spectrum: full spectrum as returned by fourier_spectrum
+    @param number_of_harmonics: Number of frequencies to pick
+    @return: Dict containing values of the frequencies
+    """
+    period = len(spectrum)
+    end = number_of_harmonics // 2
+    return {i: complex(spectrum[i % period]) for i in range(-end, end + 1)}
+
+
+def __fourier_series_dft(points: list, number_of_harmonics: int, chunk_size: int = 64) -> Dict[int, complex]:
+    """
+    Calculates the coefficients as matrix product of the points with the fourier basis
+    The basis is built for chunk_size frequencies at a time to keep the memory bounded
+    @param points: List of Points to consider
+    @param number_of_harmonics: Number of frequencies to calculate
+    @param chunk_size: Number of frequencies evaluated at once
+    @return: Dict containing values of the frequencies
+    """
+    import numpy as np
+
+    samples = np.asarray(points, dtype=np.complex128)
+    period = len(samples)
+    end = number_of_harmonics // 2
+
+    indices = np.arange(-end, end + 1)
+    phases = 2 * pi / period * np.arange(period)
+    coefficients = np.empty(len(indices), dtype=np.complex128)
+    for start in range(0, len(indices), chunk_size):
+        chunk = indices[start:start + chunk_size]
+        basis = np.exp(1.0j * np.outer(chunk, phases))
+        coefficients[start:start + chunk_size] = basis @ samples / period
+
+    return {int(i): complex(c) for i, c in zip(indices, coefficients)}
+
+
+def select_harmonics(spectrum: np.ndarray, energy: float = None, tolerance: float = None) -> int:
+    """
+    Finds the smallest number of harmonics whose partial sum meets a target
+    The coefficients are taken symmetric to 0, c_0 only places the drawing and is not counted
+    @param spectrum: full spectrum as returned by fourier_spectrum
+    @param energy: fraction of the energy (sum of |c_n|^2 without c_0) the kept coefficients have to hold
+    @param tolerance: maximum root mean square distance between the partial sum and the sampled points. By Parseval
+                      this is the square root of the energy of the dropped coefficients
+    @return: number of harmonics to pass to fourier_series / coefficients_from_spectrum
+    """
+    import numpy as np
+
+    if energy is None and tolerance is None:
+        raise ValueError('either energy or tolerance has to be given')
+
+    period = len(spectrum)
+    power = np.abs(spectrum) ** 2
+    orders = np.arange(1, period // 2 + 1)
+    # energy of the pair c_k, c_-k; for an even period the nyquist coefficient is its own pair
+    pair_power = power[orders] + np.where(orders != period - orders, power[(period - orders) % period], 0.0)
+    kept = np.cumsum(pair_power)
+    total = kept[-1] if len(kept) > 0 else 0.0
+
+    satisfied = np.ones(len(orders), dtype=bool)
+    if energy is not None:
+        satisfied &= kept >= energy * total
+    if tolerance is not None:
+        satisfied &= np.sqrt(np.maximum(total - kept, 0.0)) <= tolerance
+
+    if len(orders) == 0 or total == 0.0:
+        return 2
+    end = int(orders[np.argmax(satisfied)]) if satisfied.any() else int(orders[-1])
+    return 2 * end
+
+
+def sample(path_desc: str, number_of_points: Optional[int], sampling: str = 'parameter',
+           transform: Transform = None, number_of_harmonics: Optional[int] = None) -> np.ndarray:
+    """
+    Samples one path as the sample stage, whose record holds the number of points that were taken
+    @param path_desc: path description in string format
+    @param number_of_points: Number of points sampled from the path, None chooses it from number_of_harmonics and
+                             the shape of the path
+    @param sampling: sampling mode of determine_points
+    @param transform: optional affine transformation of the path
+    @param number_of_harmonics: Number of frequencies that will be calculated, None if not known yet
+    @return: array of complex points
+    """
+    with stage('sample', sampling=sampling) as record:
+        points = determine_points(path_desc, number_of_points, sampling=sampling, transform=transform,
+                                  number_of_harmonics=number_of_harmonics)
+        record['points'] = len(points)
+        record['auto_points'] = number_of_points is None
+    return points
+
+
+def analyse_spectrum(path_desc: str, number_of_points: Optional[int] = None, sampling: str = 'parameter',
+                     cache: CoefficientCache = None, transform: Transform = None,
+                     number_of_harmonics: Optional[int] = None) -> np.ndarray:
+    """
+    Samples one path and calculates its full spectrum with the fft
+    @param path_desc: path description in string format
+    @param number_of_points: Number of points sampled from the path, None chooses it, see sample
+    @param sampling: sampling mode of determine_points
+    @param cache: optional spectrum cache
+    @param transform: optional affine transformation of the path
+    @param number_of_harmonics: highest number of frequencies that will be taken from the spectrum, None if not
+                                known yet
+    @return: full spectrum as returned by fourier_spectrum
+    """
+    def compute_spectrum():
+        points = sample(path_desc, number_of_points, sampling=sampling, transform=transform,
+                        number_of_harmonics=number_of_harmonics)
+        with stage('transform', points=len(points), backend='fft'):
+            return fourier_spectrum(points)
+
+    if cache is None:
+        return compute_spectrum()
+    if number_of_points is None:
+        from fourier.path_sampling import point_count
+
+        # the key holds the chosen number, so a cached spectrum is the one this call would compute
+        number_of_points = point_count(path_desc, number_of_harmonics)
+    return cache.spectrum(path_desc, number_of_points, sampling, compute_spectrum, transform=transform)
+
+
+def analyse(path_desc: str, number_of_harmonics: Optional[int], number_of_points: Optional[int] = None,
+            sampling: str = 'parameter', backend: str = 'fft', cache: CoefficientCache = None,
+            transform: Transform = None, energy: float = None, tolerance: float = None) -> Dict[int, complex]:
+    """
+    Samples one path and calculates its fourier coefficients
+    @param path_desc: path description in string format
+    @param number_of_harmonics: Number of frequencies to calculate, None selects it with select_harmonics
+    @param number_of_points: Number of points sampled from the path, None chooses it, see sample
+    @param sampling: sampling mode of determine_points
+    @param backend: backend of fourier_series, not used for spectra taken from the cache or automatic selection
+    @param cache: optional spectrum cache
+    @param transform: optional affine transformation of the path
+    @param energy: energy target of the automatic selection
+    @param tolerance: error target of the automatic selection
+    @return: Dict containing values of the frequencies
+    """
+    if cache is None and number_of_harmonics is not None:
+        points = sample(path_desc, number_of_points, sampling=sampling, transform=transform,
+                        number_of_harmonics=number_of_harmonics)
+        with stage('transform', points=len(points), harmonics=number_of_harmonics, backend=backend):
+            return fourier_series(points, number_of_harmonics, backend=backend)
+
+    spectrum = analyse_spectrum(path_desc, number_of_points=number_of_points, sampling=sampling, cache=cache,
+                                transform=transform, number_of_harmonics=number_of_harmonics)
+    if number_of_harmonics is None:
+        with stage('select', energy=energy, tolerance=tolerance) as record:
+            number_of_harmonics = select_harmonics(spectrum, energy=energy, tolerance=tolerance)
+            record['harmonics'] = number_of_harmonics
+    return coefficients_from_spectrum(spectrum, number_of_harmonics)
+
+
+def render(input_file: str, output_file: str, number_of_harmonics: Optional[int], number_of_points: int = None,
+           sampling: str = 'parameter', backend: str = 'fft', cache: CoefficientCache = None, workers: int = None,
+           energy: float = None, tolerance: float = None, top_k: int = None, threshold: float = None,
+           layout: str = 'nested', keyframes: int = None, digits: int = None, decimals: int = None,
+           coefficients_file: str = None, coefficients_dtype: str = 'complex128', lod: List[int] = None,
+           max_paths: int = None):
+    """
+    Runs the whole pipeline for one drawing: parse, sample, transform and draw
+    Every subpath of the drawing gets its own set of coefficients, the subpaths are analysed in parallel threads
+    With lod the drawing is sampled and transformed once and every level of detail is drawn from the same spectra
+    in parallel processes
+    @param input_file: svg file containing the paths
+    @param output_file: svg file to write the animation to, a name ending in .svgz is compressed while it is written
+    @param number_of_harmonics: Number of frequencies to draw per subpath, None selects it per subpath from
+                                energy or tolerance, ignored if lod is given
+    @param number_of_points: Number of points sampled from each subpath, None chooses it per subpath, see sample
+    @param sampling: sampling mode of determine_points
+    @param backend: backend of fourier_series, not used for spectra taken from the cache
+    @param cache: optional spectrum cache
+    @param workers: maximum number of threads used for the subpaths and of processes used for the levels of detail
+    @param energy: energy target of the automatic selection, see select_harmonics
+    @param tolerance: error target of the automatic selection, see select_harmonics
+    @param top_k: draw only the top_k strongest frequencies of every subpath
+    @param threshold: draw only frequencies whose amplitude is at least threshold * width of the drawing
+    @param layout: 'nested', 'flat' or 'shared' arrangement of the circles, see build_result
+    @param keyframes: number of keyframes per period of the flat layout
+    @param digits: number of significant digits of the written numbers, None for full precision
+    @param decimals: number of decimal places of the written numbers, used if digits is None
+    @param coefficients_file: optional .npy or .npz file to save the coefficients of all subpaths to, see
+                              coefficient_file.save_coefficients
+    @param coefficients_dtype: precision of the saved coefficients, 'complex64' or 'complex128'
+    @param lod: numbers of harmonics of the levels of detail, level n is written to lod_file(output_file, n)
+    @param max_paths: only animate the first max_paths paths, the rest of the file is not read
+    """
+    with stage('parse') as record:
+        svg = SvgPath(input_file, max_paths=max_paths)
+        subpaths = svg.subpaths()
+        record['paths'] = len(svg.paths)
+        record['subpaths'] = len(subpaths)
+
+    def analyse_subpath(subpath):
+        if lod is not None:
+            return analyse_spectrum(subpath[0], number_of_points=number_of_points, sampling=sampling, cache=cache,
+                                    transform=subpath[1], number_of_harmonics=max(lod))
+        return analyse(subpath[0], number_of_harmonics, number_of_points=number_of_points, sampling=sampling,
+                       backend=backend, cache=cache, transform=subpath[1], energy=energy, tolerance=tolerance)
+
+    if len(subpaths) == 1:
+        coefficients = [analyse_subpath(subpaths[0])]
+    else:
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            coefficients = list(executor.map(analyse_subpath, subpaths))
+
+    options = {'top_k': top_k, 'threshold': threshold, 'layout': layout, 'keyframes': keyframes, 'digits': digits,
+               'decimals': decimals}
+    if lod is None:
+        if coefficients_file is not None:
+            with stage('save') as record:
+                save_coefficients(coefficients_file, coefficients, svg, dtype=coefficients_dtype)
+                record['file_bytes'] = os.path.getsize(coefficients_file)
+        write_result(svg, coefficients, output_file, **options)
+        return
+
+    spectra = coefficients
+    if coefficients_file is not None:
+        with stage('save') as record:
+            finest = [coefficients_from_spectrum(spectrum, max(lod)) for spectrum in spectra]
+            save_coefficients(coefficients_file, finest, svg, dtype=coefficients_dtype)
+            record['file_bytes'] = os.path.getsize(coefficients_file)
+
+    levels = [(level, [coefficients_from_spectrum(spectrum, level) for spectrum in spectra]) for level in lod]
+    trace_memory = tracemalloc.is_tracing()
+    if len(levels) == 1:
+        write_result(svg, levels[0][1], lod_file(output_file, levels[0][0]), **options)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_write_level, svg, level, coefficients, lod_file(output_file, level), options,
+                                   trace_memory) for level, coefficients in levels]
+        for future in futures:
+            report(future.result())
+
+
+def write_result(svg: SvgPath, coefficients: List[Dict[int, complex]], output_file: str, **options):
+    """
+    Draws the coefficients of all subpaths into a file
+    @param svg: drawing the coefficients belong to
+    @param coefficients: one dict of coefficients per subpath
+    @param output_file: svg file to write the animation to, a name ending in .svgz is compressed while it is written
+    @param options: further arguments of draw_result
+    """
+    compress = output_file.endswith('.svgz')
+    with gzip.open(output_file, mode='wt', encoding='utf-8') if compress else open(output_file, mode='w') as fd:
+        draw_result(svg, coefficients, out=fd, **options)
+        fd.write('\n')
+
+    note('output', file_bytes=os.path.getsize(output_file), compressed=compress)
+
+
+def lod_file(output_file: str, level: int) -> str:
+    """
+    Name of the file of one level of detail, e.g. bird.svg -> bird.lod32.svg
+    """
+    base, extension = os.path.splitext(output_file)
+    return base + '.lod' + str(level) + extension
+
+
+def _write_level(svg: SvgPath, level: int, coefficients: List[Dict[int, complex]], output_file: str, options: dict,
+                 trace_memory: bool) -> List[dict]:
+    """
+    Runs write_result for one level of detail in a worker process
+    @return: records of the stages, tagged with the level
+    """
+    with Stats(trace_memory=trace_memory) as stats:
+        write_result(svg, coefficients, output_file, **options)
+    for record in stats.records:
+        record['level'] = level
+    return stats.records
+
+
+def auto_argument(value: str) -> Optional[int]:
+    if value == 'auto':
+        return None
+    return int(value)
+
+
+def positive_argument(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError('expected a positive number, got ' + value)
+    return number
+
+
+def non_negative_argument(value: str) -> int:
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError('expected a number of at least 0, got ' + value)
+    return number
+
+
+def non_negative_float_argument(value: str) -> float:
+    number = float(value)
+    if not number >= 0:
+        raise argparse.ArgumentTypeError('expected a number of at least 0, got ' + value)
+    return number
+
+
+def lod_argument(value: str) -> List[int]:
+    levels = sorted(set(int(level) for level in value.split(',') if level.strip() != ''))
+    if len(levels) == 0 or levels[0] < 1:
+        raise argparse.ArgumentTypeError('expected a comma separated list of positive numbers of harmonics')
+    return levels
+
+
+def tolerance_argument(value: str) -> float:
+    if value.endswith('px'):
+        value = value[:-2]
+    return float(value)
+
+
+def print_size_report(records: List[dict]):
+    """
+    Prints the size of the written file compared to the formatted svg if it was compressed
+    """
+    formatted = [record['output_bytes'] for record in records if record['stage'] == 'format']
+    written = [record for record in records if record['stage'] == 'output']
+    if len(formatted) == 0 or len(written) == 0 or not written[-1]['compressed'] or formatted[-1] == 0:
+        return
+    print('%d bytes written, %d bytes uncompressed (%.1f%% smaller)'
+          % (written[-1]['file_bytes'], formatted[-1], 100 * (1 - written[-1]['file_bytes'] / formatted[-1])))
+
+
+def main():
+    missing = object()
+    parser = argparse.ArgumentParser(prog='fourier')
+    parser.add_argument('input_file')
+    parser.add_argument('output_file')
+    parser.add_argument('number_of_harmonics', type=auto_argument, nargs='?', default=missing,
+                        help='number of harmonics or "auto" to select it from --energy or --tolerance, '
+                             'not needed with --lod')
+    parser.add_argument('--energy', type=float, default=None,
+                        help='with auto harmonics: fraction of the spectral energy to keep (default: 0.999)')
+    parser.add_argument('--tolerance', type=tolerance_argument, default=None,
+                        help='with auto harmonics: maximum root mean square error of the drawing, e.g. 0.5px')
+    parser.add_argument('--top-k', type=non_negative_argument, default=None,
+                        help='draw only the strongest frequencies, chained by decreasing amplitude')
+    parser.add_argument('--threshold', type=non_negative_float_argument, default=None,
+                        help='draw only frequencies with an amplitude of at least THRESHOLD * width of the drawing')
+    parser.add_argument('--layout', choices=layouts, default='nested',
+                        help='nested groups following each other, a flat layout with precomputed keyframes or '
+                             'nested groups sharing one unit circle per direction')
+    parser.add_argument('--keyframes', type=positive_argument, default=None,
+                        help='keyframes per period of the flat layout (default: 8 per turn of the fastest circle)')
+    parser.add_argument('--digits', type=int, default=None,
+                        help='significant digits of the numbers in the output (default: full precision)')
+    parser.add_argument('--decimals', type=int, default=None,
+                        help='decimal places of the numbers in the output, ignored if --digits is given')
+    parser.add_argument('--lod', type=lod_argument, default=None, metavar='N,N,...',
+                        help='analyse once and write one file per number of harmonics, e.g. 8,32,128,512 writes '
+                             'name.lod8.svg to name.lod512.svg; replaces number_of_harmonics')
+    parser.add_argument('--save-coefficients', metavar='FILE',
+                        help='also save the coefficients to a .npy or .npz file for fourier-render')
+    parser.add_argument('--coefficients-dtype', choices=dtypes, default='complex128',
+                        help='precision of the saved coefficients (default: complex128)')
+    parser.add_argument('--points', type=auto_argument, default=None,
+                        help='number of points sampled from every subpath or "auto" to choose it from the harmonics, '
+                             'the length and the curvature of the subpath (default: auto)')
+    parser.add_argument('--backend', choices=backends, default='fft',
+                        help='method used to calculate the fourier coefficients (default: fft)')
+    parser.add_argument('--sampling', choices=samplings, default='parameter',
+                        help='spacing of the sampled points along the path (default: parameter)')
+    parser.add_argument('--cache-dir',
+                        help='directory to cache spectra in, cached results are always calculated with the fft')
+    parser.add_argument('--cache-size', type=float, default=512,
+                        help='maximum size of the cache directory in MiB (default: 512)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='maximum number of threads analysing the subpaths and of processes drawing the levels '
+                             'of --lod')
+    parser.add_argument('--max-paths', type=positive_argument, default=None,
+                        help='only animate the first MAX_PATHS paths of the drawing, the rest is not read')
+    parser.add_argument('--stats', action='store_true',
+                        help='print wall time, cpu time, peak memory and counts of every stage')
+    parser.add_argument('--stats-json', metavar='FILE', help='write the stage records to a json file')
+    parser.add_argument('--profile', metavar='FILE', help='run under cProfile and write the profile to FILE')
+    args = parser.parse_args()
+    if args.number_of_harmonics is missing:
+        if args.lod is None:
+            parser.error('number_of_harmonics is required without --lod')
+        args.number_of_harmonics = None
+
+    if args.lod is None and args.number_of_harmonics is None and args.energy is None and args.tolerance is None:
+        args.energy = 0.999
+
+    cache = None
+    if args.cache_dir is not None:
+        cache = CoefficientCache(args.cache_dir, int(args.cache_size * 2 ** 20))
+
+    profile = None
+    if args.profile is not None:
+        import cProfile
+
+        profile = cProfile.Profile()
+    with Stats(trace_memory=args.stats or args.stats_json is not None) as stats:
+        if profile is not None:
+            profile.enable()
+        try:
+            render(args.input_file, args.output_file, args.number_of_harmonics, number_of_points=args.points,
+                   sampling=args.sampling, backend=args.backend, cache=cache, workers=args.workers,
+                   energy=args.energy, tolerance=args.tolerance, top_k=args.top_k, threshold=args.threshold,
+                   layout=args.layout, keyframes=args.keyframes, digits=args.digits, decimals=args.decimals,
+                   coefficients_file=args.save_coefficients, coefficients_dtype=args.coefficients_dtype,
+                   lod=args.lod, max_paths=args.max_paths)
+        finally:
+            if profile is not None:
+                profile.disable()
+                profile.dump_stats(args.profile)
+
+    if args.stats:
+        stats.print()
+    print_size_report(stats.records)
+    if args.stats_json is not None:
+        with open(args.stats_json, mode='w') as fd:
+            json.dump({'input_file': args.input_file, 'output_file': args.output_file, 'stages': stats.records}, fd,
+                      indent=1)
+    print("done\n")
+
+
+if __name__ == '__main__':
+    main()
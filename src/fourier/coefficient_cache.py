@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+
+from typing import TYPE_CHECKING, Callable, Optional
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class CoefficientCache:
+    """
+    On-disk cache of fourier spectra
+    Every entry is a .npz file holding the full spectrum of a sampled path, so any number of harmonics up to half the
+    number of points is a slice of it. Entries are evicted least recently used first once the directory grows beyond
+    max_bytes
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 512 * 2 ** 20):
+        """
+        @param directory: directory to store the entries in, created if it does not exist
+        @param max_bytes: maximum total size of all entries
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(path_desc: str, number_of_points: int, sampling: str, transform: tuple = None) -> str:
+        """
+        Builds the key of an entry
+        @param path_desc: path description in string format
+        @param number_of_points: number of sampled points, the resolved one if determine_points chose it
+        @param sampling: sampling mode of determine_points
+        @param transform: optional affine transformation applied to the points
+        @return: hex digest identifying the spectrum
+        """
+        digest = hashlib.sha256()
+        digest.update(path_desc.encode('utf-8'))
+        digest.update(b'\0' + str(number_of_points).encode('ascii'))
+        digest.update(b'\0' + sampling.encode('ascii'))
+        if transform is not None:
+            digest.update(b'\0' + repr(tuple(transform)).encode('ascii'))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """
+        Loads an entry and marks it as recently used
+        @param key: key as returned by CoefficientCache.key
+        @return: the spectrum or None if there is no (readable) entry
+        """
+        import numpy as np
+
+        file_path = self.__file_path(key)
+        try:
+            with np.load(file_path) as data:
+                spectrum = data['spectrum']
+            os.utime(file_path)
+        except (OSError, KeyError, ValueError):
+            return None
+        return spectrum
+
+    def put(self, key: str, spectrum: np.ndarray):
+        """
+        Stores an entry and evicts old entries if the cache grew too large
+        @param key: key as returned by CoefficientCache.key
+        @param spectrum: full spectrum to store
+        """
+        import numpy as np
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                np.savez(tmp, spectrum=spectrum)
+            os.replace(tmp_path, self.__file_path(key))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        self.__evict()
+
+    def spectrum(self, path_desc: str, number_of_points: int, sampling: str, compute: Callable[[], np.ndarray],
+                 transform: tuple = None) -> np.ndarray:
+        """
+        Returns the cached spectrum of a path or computes and stores it
+        @param path_desc: path description in string format
+        @param number_of_points: number of sampled points, the resolved one if determine_points chose it
+        @param sampling: sampling mode of determine_points
+        @param compute: called without arguments to calculate the spectrum of number_of_points points on a miss
+        @param transform: optional affine transformation applied to the points
+        @return: full spectrum
+        """
+        key = self.key(path_desc, number_of_points, sampling, transform)
+        spectrum = self.get(key)
+        if spectrum is None:
+            spectrum = compute()
+            self.put(key, spectrum)
+        return spectrum
+
+    def __file_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + '.npz')
+
+    def __evict(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.npz'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    # removed by a concurrent eviction
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, file_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(file_path)
+            except FileNotFoundError:
+                pass
+            total -= size
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import struct
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from fourier.svg_processor import SvgPath
+
+if TYPE_CHECKING:
+    import numpy as np
+
+dtypes = ('complex64', 'complex128')
+
+
+def record_dtype(dtype: str = 'complex128') -> np.dtype:
+    """
+    Type of one stored coefficient: number of the subpath, frequency and value
+    @param dtype: 'complex64' or 'complex128' precision of the values
+    """
+    import numpy as np
+
+    if dtype not in dtypes:
+        raise ValueError('unknown dtype "' + str(dtype) + '", expected one of ' + ', '.join(dtypes))
+    return np.dtype([('subpath', '<u4'), ('index', '<i4'), ('value', '<c8' if dtype == 'complex64' else '<c16')])
+
+
+def frequency_order(end: int) -> np.ndarray:
+    """
+    Frequencies in the order they are stored: 0, -1, 1, -2, 2, ... -end, end
+    Any number of harmonics up to 2 * end is then a prefix of the stored coefficients
+    """
+    import numpy as np
+
+    order = np.zeros(2 * end + 1, dtype=np.int32)
+    order[1::2] = -np.arange(1, end + 1)
+    order[2::2] = np.arange(1, end + 1)
+    return order
+
+
+def save_coefficients(file_path: str, coefficients: List[Dict[int, complex]], svg: SvgPath = None,
+                      dtype: str = 'complex128'):
+    """
+    Writes the coefficients of all subpaths as one record array
+    A .npy file holds only the coefficients, a .npz file additionally the dimensions, paths and transformations of the
+    drawing, so it can be rendered without the original svg. The arrays of a .npz file are stored uncompressed to be
+    memory mappable
+    @param file_path: file ending in .npy or .npz
+    @param coefficients: one dict of coefficients symmetric to 0 per subpath, as returned by fourier.analyse
+    @param svg: drawing the coefficients belong to, required for .npz files
+    @param dtype: 'complex64' or 'complex128' precision of the values
+    """
+    import numpy as np
+
+    chunks = []
+    for k, harmonics in enumerate(coefficients):
+        order = frequency_order(max(harmonics) if len(harmonics) != 0 else 0)
+        chunk = np.empty(len(order), dtype=record_dtype(dtype))
+        chunk['subpath'] = k
+        chunk['index'] = order
+        chunk['value'] = [harmonics[i] for i in order.tolist()]
+        chunks.append(chunk)
+    records = np.concatenate(chunks) if len(chunks) != 0 else np.empty(0, dtype=record_dtype(dtype))
+
+    if file_path.endswith('.npy'):
+        np.save(file_path, records)
+    elif file_path.endswith('.npz'):
+        if svg is None:
+            raise ValueError('a .npz file needs the drawing, pass svg')
+        transforms = np.array([t if t is not None else (np.nan,) * 6 for t in svg.transforms], dtype=np.float64)
+        view_box = np.array(svg.view_box if svg.view_box is not None else (), dtype=np.float64)
+        np.savez(file_path, coefficients=records, size=np.array([svg.width, svg.height], dtype=np.float64),
+                 view_box=view_box, paths=np.array(svg.paths, dtype=np.str_), transforms=transforms.reshape(-1, 6))
+    else:
+        raise ValueError('coefficient file has to end in .npy or .npz: ' + str(file_path))
+
+
+def load_coefficients(file_path: str) -> Tuple[np.ndarray, Optional[SvgPath]]:
+    """
+    Memory maps the coefficients written by save_coefficients
+    @param file_path: .npy or .npz file
+    @return: read only record array backed by the file, and the drawing if the file contains it
+    """
+    import numpy as np
+
+    if file_path.endswith('.npy'):
+        return np.load(file_path, mmap_mode='r'), None
+
+    records = _memmap_member(file_path, 'coefficients')
+    with np.load(file_path) as data:
+        width, height = data['size'].tolist()
+        view_box = tuple(data['view_box'].tolist())
+        transforms = [None if np.isnan(row).any() else tuple(row) for row in data['transforms'].tolist()]
+        svg = SvgPath.from_paths(width, height, data['paths'].tolist(), transforms,
+                                 view_box=view_box if len(view_box) != 0 else None)
+    return records, svg
+
+
+def select_coefficients(records: np.ndarray, number_of_harmonics: int = None) -> List[Dict[int, complex]]:
+    """
+    Picks the lowest frequencies of every subpath
+    Only the selected records are read, the slices of a memory mapped array are views of the file
+    @param records: record array as returned by load_coefficients
+    @param number_of_harmonics: Number of frequencies per subpath, None for all stored ones
+    @return: one dict of coefficients symmetric to 0 per subpath
+    """
+    import numpy as np
+
+    subpaths = records['subpath']
+    count = int(subpaths[-1]) + 1 if len(records) != 0 else 0
+    bounds = np.searchsorted(subpaths, np.arange(count + 1))
+
+    ret = []
+    for k in range(count):
+        start, stop = int(bounds[k]), int(bounds[k + 1])
+        if number_of_harmonics is not None:
+            stop = min(stop, start + 2 * (number_of_harmonics // 2) + 1)
+        chunk = records[start:stop]
+        ret.append(dict(zip(chunk['index'].tolist(), chunk['value'].tolist())))
+    return ret
+
+
+def _memmap_member(file_path: str, name: str) -> np.ndarray:
+    """
+    Memory maps an array stored uncompressed in a .npz file
+    """
+    import zipfile
+
+    import numpy as np
+
+    with zipfile.ZipFile(file_path) as archive:
+        info = archive.getinfo(name + '.npy')
+    if info.compress_type != zipfile.ZIP_STORED:
+        raise ValueError(str(file_path) + ' is compressed and cannot be memory mapped')
+
+    with open(file_path, 'rb') as fd:
+        fd.seek(info.header_offset)
+        # local file header: signature, versions, flags, dates, crc, sizes, name and extra field lengths
+        header = struct.unpack('<4s5H3I2H', fd.read(30))
+        if header[0] != b'PK\x03\x04':
+            raise ValueError('corrupt zip entry ' + name + ' in ' + str(file_path))
+        fd.seek(header[9] + header[10], 1)
+
+        version = np.lib.format.read_magic(fd)
+        if version == (1, 0):
+            shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(fd)
+        else:
+            shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(fd)
+        offset = fd.tell()
+    if 0 in shape:
+        # an empty file region cannot be mapped
+        return np.empty(shape, dtype=dtype)
+    return np.memmap(file_path, dtype=dtype, mode='r', offset=offset, shape=shape,
+                     order='F' if fortran_order else 'C')
@@ -0,0 +1,142 @@
+import threading
+import time
+import tracemalloc
+
+from contextlib import contextmanager
+from typing import Callable, List
+
+# callables hook(event, name, record), event is 'start' or 'end'
+_hooks = []
+
+# stages running in any thread by id of their record, True once another stage ran at the same time; tracemalloc has
+# only one process wide peak to share between them
+_running = {}
+_running_lock = threading.Lock()
+
+
+def add_hook(hook: Callable[[str, str, dict], None]):
+    """
+    Registers a hook that is called at the start and the end of every pipeline stage
+    The record is the same dict for both calls; on 'end' it contains wall, cpu and, while tracemalloc is tracing,
+    peak_memory in addition to the counts the stage reports (points, harmonics, elements, ...)
+    cpu time is process wide, stages running at the same time in other threads add to it. peak_memory is only
+    recorded for stages during which no other stage ran, the peak of overlapping stages cannot be told apart
+    @param hook: callable taking (event, stage name, record)
+    """
+    _hooks.append(hook)
+
+
+def remove_hook(hook: Callable[[str, str, dict], None]):
+    _hooks.remove(hook)
+
+
+@contextmanager
+def stage(name: str, **info):
+    """
+    Marks a stage of the pipeline
+    The yielded record can be extended by the stage, e.g. with the number of elements it produced
+    @param name: name of the stage
+    @param info: initial values of the record
+    """
+    record = {'stage': name}
+    record.update(info)
+    for hook in list(_hooks):
+        hook('start', name, record)
+
+    tracing = tracemalloc.is_tracing()
+    with _running_lock:
+        overlapping = len(_running) != 0
+        for key in _running:
+            _running[key] = True
+        _running[id(record)] = overlapping
+        if tracing and not overlapping:
+            # nothing else is measuring the peak right now
+            tracemalloc.reset_peak()
+    if tracing:
+        memory_start, _ = tracemalloc.get_traced_memory()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        yield record
+    finally:
+        record['wall'] = time.perf_counter() - wall_start
+        record['cpu'] = time.process_time() - cpu_start
+        with _running_lock:
+            overlapped = _running.pop(id(record))
+            if tracing and not overlapped:
+                _, peak = tracemalloc.get_traced_memory()
+                record['peak_memory'] = max(peak - memory_start, 0)
+        for hook in list(_hooks):
+            hook('end', name, record)
+
+
+def note(name: str, **info):
+    """
+    Passes a record that belongs to no timed stage, e.g. the size of a written file, to the hooks
+    The hooks only get its 'end' event, the record has no wall, cpu or peak_memory
+    @param name: name of the record
+    @param info: values of the record
+    """
+    record = {'stage': name}
+    record.update(info)
+    for hook in list(_hooks):
+        hook('end', name, record)
+
+
+def report(records: List[dict]):
+    """
+    Passes records of stages that ran elsewhere, e.g. in a worker process, to the hooks of this process
+    The hooks only get the 'end' event of these stages
+    @param records: finished records as collected by Stats
+    """
+    for record in records:
+        for hook in list(_hooks):
+            hook('end', record['stage'], record)
+
+
+class Stats:
+    """
+    Hook collecting the records of all stages that end while it is active
+
+        with Stats() as stats:
+            render(...)
+        stats.print()
+    """
+
+    def __init__(self, trace_memory: bool = True):
+        self.trace_memory = trace_memory
+        self.records: List[dict] = []
+        self.__started_tracing = False
+
+    def __call__(self, event: str, name: str, record: dict):
+        if event == 'end':
+            self.records.append(record)
+
+    def __enter__(self):
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__started_tracing = True
+        add_hook(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        remove_hook(self)
+        if self.__started_tracing:
+            tracemalloc.stop()
+            self.__started_tracing = False
+
+    def print(self, file=None):
+        """
+        Prints one line per stage record
+        """
+        for record in self.records:
+            details = ', '.join(str(key) + '=' + str(value) for key, value in record.items()
+                                if key not in ('stage', 'wall', 'cpu', 'peak_memory'))
+            line = '%-10s' % record['stage']
+            if 'wall' in record:
+                line += ' wall %9.4fs  cpu %9.4fs' % (record['wall'], record['cpu'])
+            if 'peak_memory' in record:
+                line += '  peak %10.1f KiB' % (record['peak_memory'] / 1024)
+            if details != '':
+                line += '  ' + details
+            print(line, file=file)
@@ -0,0 +1,282 @@
+import math
+
+from typing import Optional
+
+import numpy as np
+from svg.path import parse_path
+
+from fourier.svg_processor import Transform, samplings
+
+
+def apply_transform(points: np.ndarray, transform: Optional[Transform]) -> np.ndarray:
+    """
+    Applies an affine transformation to complex points
+    """
+    if transform is None:
+        return points
+    a, b, c, d, e, f = transform
+    return (a * points.real + c * points.imag + e) + 1.0j * (b * points.real + d * points.imag + f)
+
+
+# limits of the automatically chosen number of points, both 5-smooth
+min_points = 256
+max_points = 2 ** 20
+# points per period of the highest requested frequency, 4 times the minimum of the sampling theorem so that the
+# aliases of the dropped frequencies hardly distort the kept coefficients
+oversampling = 8
+# points per size of the path (larger side of its bounding box) along its length
+points_per_extent = 512
+# maximum turn of the tangent between two points in radians
+max_turn = math.pi / 90
+
+
+def smooth_size(n: int) -> int:
+    """
+    Smallest number of at least n without prime factors other than 2, 3 and 5, the sizes the fft handles fastest
+    """
+    best = 1 << max(n - 1, 0).bit_length()
+    power5 = 1
+    while power5 < best:
+        power35 = power5
+        while power35 < best:
+            size = power35
+            while size < n:
+                size *= 2
+            best = min(best, size)
+            power35 *= 3
+        power5 *= 5
+    return best
+
+
+def harmonic_points(number_of_harmonics: int) -> int:
+    """
+    Number of points needed to resolve the highest of number_of_harmonics frequencies symmetric to 0
+    """
+    return oversampling * (number_of_harmonics // 2)
+
+
+def point_count(path_desc: str, number_of_harmonics: Optional[int] = None) -> int:
+    """
+    Number of points determine_points samples from a path if it is not given
+    :param path_desc: path description in string format
+    :param number_of_harmonics: number of frequencies that will be taken from the points
+    :return: number of points, see _SegmentTable.sample_count
+    """
+    return _SegmentTable(parse_path(path_desc)).sample_count(number_of_harmonics)
+
+
+def determine_points(path_desc: str, number_of_points: Optional[int], sampling: str = 'parameter',
+                     transform: Optional[Transform] = None, number_of_harmonics: Optional[int] = None) -> np.ndarray:
+    """
+    Extracts points from a given description of a svg-Path
+    All segments are evaluated at once with numpy instead of calling svg.path for every single point
+    :param path_desc: path description in string format
+    :param number_of_points: number of points to sample, None chooses it with _SegmentTable.sample_count
+    :param sampling: 'parameter' spaces the points like svg.path's Path.point(i / number_of_points), i.e. every
+                     segment gets a share of points proportional to its length, but the points are uniform in the
+                     curve parameter of the segment. 'arclength' spaces the points uniformly along the path
+    :param transform: optional affine transformation applied to the points
+    :param number_of_harmonics: number of frequencies that will be taken from the points, used to choose their number
+    :return: array of complex points
+    """
+    # parse path
+    segments = _SegmentTable(parse_path(path_desc))
+    if number_of_points is None:
+        number_of_points = segments.sample_count(number_of_harmonics)
+
+    # calculate points
+    if sampling == 'parameter':
+        positions = np.arange(number_of_points) / number_of_points
+        points = segments.points_at_fraction(positions)
+    elif sampling == 'arclength':
+        distances = np.arange(number_of_points) / number_of_points * segments.length
+        points = segments.points_at_length(distances)
+    else:
+        raise ValueError('unknown sampling "' + str(sampling) + '", expected one of ' + ', '.join(samplings))
+    return apply_transform(points, transform)
+
+
+# Gauss-Legendre nodes and weights on [0, 1] used to integrate the speed of the segments
+_gauss_nodes, _gauss_weights = np.polynomial.legendre.leggauss(5)
+_gauss_nodes = (_gauss_nodes + 1) / 2
+_gauss_weights = _gauss_weights / 2
+
+
+class _SegmentTable:
+    """
+    Flattened representation of a parsed svg.path Path
+    Every segment is stored as one row of coefficient arrays, grouped by segment kind, so that a whole array of
+    positions can be evaluated at once
+    """
+    LINE = 0
+    QUADRATIC = 1
+    CUBIC = 2
+    ARC = 3
+
+    # number of sub intervals per segment of the arc length table
+    subdivisions = 16
+
+    def __init__(self, path):
+        rows = []
+        for segment in path:
+            name = type(segment).__name__
+            if name == 'Move':
+                continue
+            if name == 'QuadraticBezier':
+                rows.append((self.QUADRATIC, segment.start, segment.control, 0j, segment.end, 0.0, 0.0, 0.0))
+            elif name == 'CubicBezier':
+                rows.append((self.CUBIC, segment.start, segment.control1, segment.control2, segment.end,
+                             0.0, 0.0, 0.0))
+            elif name == 'Arc' and segment.start != segment.end and segment.radius.real != 0 \
+                    and segment.radius.imag != 0:
+                rows.append((self.ARC, segment.start, segment.center, segment.radius * segment.radius_scale,
+                             segment.end, np.radians(segment.rotation), np.radians(segment.theta),
+                             np.radians(segment.delta)))
+            else:
+                # lines, closing lines and degenerated arcs
+                rows.append((self.LINE, segment.start, 0j, 0j, segment.end, 0.0, 0.0, 0.0))
+
+        if len(rows) == 0:
+            start = path[0].start if len(path) > 0 else 0j
+            rows.append((self.LINE, start, 0j, 0j, start, 0.0, 0.0, 0.0))
+
+        columns = list(zip(*rows))
+        self.kind = np.array(columns[0], dtype=np.int8)
+        self.start = np.array(columns[1], dtype=np.complex128)
+        self.c1 = np.array(columns[2], dtype=np.complex128)
+        self.c2 = np.array(columns[3], dtype=np.complex128)
+        self.end = np.array(columns[4], dtype=np.complex128)
+        self.rotation = np.array(columns[5], dtype=np.float64)
+        self.theta = np.array(columns[6], dtype=np.float64)
+        self.delta = np.array(columns[7], dtype=np.float64)
+
+        self.table = self.__length_table()
+        self.lengths = self.table[:, -1]
+        self.length = float(self.lengths.sum())
+
+    def evaluate(self, index: np.ndarray, t: np.ndarray, derivative: bool = False) -> np.ndarray:
+        """
+        Evaluates the segments
+        :param index: segment of every point
+        :param t: curve parameter in [0, 1] of every point
+        :param derivative: evaluate the first derivative instead of the point
+        :return: array of complex points
+        """
+        ret = np.empty(len(t), dtype=np.complex128)
+        kind = self.kind[index]
+        for k in np.unique(kind):
+            mask = kind == k
+            i = index[mask]
+            ret[mask] = self.__evaluate_kind(k, i, t[mask], derivative=derivative)
+        return ret
+
+    def sample_count(self, number_of_harmonics: Optional[int] = None) -> int:
+        """
+        Chooses the number of points to sample from the requested frequencies and the shape of the path
+        The points have to resolve the highest frequency with oversampling points per period, follow the length of
+        the path with points_per_extent points per size of the path and let the tangent turn at most max_turn between
+        two of them. The shape is measured before any transformation
+        :param number_of_harmonics: number of frequencies that will be taken from the points, None if not known yet
+        :return: 5-smooth number between min_points and max_points
+        """
+        count = float(min_points)
+        if number_of_harmonics is not None:
+            count = max(count, harmonic_points(number_of_harmonics))
+
+        t = np.linspace(0.0, 1.0, self.subdivisions + 1)
+        index = np.repeat(np.arange(len(self.kind)), len(t))
+        t = np.tile(t, len(self.kind))
+        positions = self.evaluate(index, t)
+        extent = max(np.ptp(positions.real), np.ptp(positions.imag))
+        if extent > 0:
+            count = max(count, self.length / extent * points_per_extent)
+
+        # turn of the tangent within the segments, corners between segments need no extra points
+        velocity = self.evaluate(index, t, derivative=True).reshape(len(self.kind), -1)
+        turning = float(np.abs(np.angle(velocity[:, 1:] * np.conj(velocity[:, :-1]))).sum())
+        count = max(count, turning / max_turn)
+        return min(smooth_size(math.ceil(count)), max_points)
+
+    def points_at_fraction(self, positions: np.ndarray) -> np.ndarray:
+        """
+        Evaluates the path at fractions of its length the same way as svg.path's Path.point
+        The segment is chosen by its share of the length, the position within the segment by its curve parameter
+        :param positions: array of values in [0, 1]
+        :return: array of complex points
+        """
+        if self.length == 0:
+            return np.full(len(positions), self.start[0], dtype=np.complex128)
+
+        fractions = np.cumsum(self.lengths) / self.length
+        index = np.minimum(np.searchsorted(fractions, positions, side='right'), len(fractions) - 1)
+        previous = np.where(index > 0, fractions[index - 1], 0.0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.clip((positions - previous) / (fractions[index] - previous), 0.0, 1.0)
+        return self.evaluate(index, np.nan_to_num(t))
+
+    def points_at_length(self, distances: np.ndarray) -> np.ndarray:
+        """
+        Evaluates the path at given arc lengths by inverting the precomputed arc length table
+        :param distances: array of values in [0, length]
+        :return: array of complex points
+        """
+        if self.length == 0:
+            return np.full(len(distances), self.start[0], dtype=np.complex128)
+
+        offsets = np.concatenate(([0.0], np.cumsum(self.lengths)[:-1]))
+        cumulative = (self.table + offsets[:, None]).ravel()
+        parameters = (np.arange(len(self.kind))[:, None]
+                      + np.linspace(0.0, 1.0, self.subdivisions + 1)[None, :]).ravel()
+        u = np.interp(distances, cumulative, parameters)
+        index = np.minimum(np.floor(u).astype(np.intp), len(self.kind) - 1)
+        return self.evaluate(index, np.clip(u - index, 0.0, 1.0))
+
+    def __length_table(self) -> np.ndarray:
+        """
+        Integrates the speed of every segment with gaussian quadrature on equally sized sub intervals
+        :return: array (segments x subdivisions + 1) with the arc length from the start of the segment
+        """
+        count = len(self.kind)
+        steps = self.subdivisions
+        t = ((np.arange(steps)[:, None] + _gauss_nodes[None, :]) / steps).ravel()
+        index = np.repeat(np.arange(count), len(t))
+        t = np.tile(t, count)
+
+        speed = np.empty(len(t), dtype=np.float64)
+        kind = self.kind[index]
+        for k in np.unique(kind):
+            mask = kind == k
+            speed[mask] = np.abs(self.__evaluate_kind(k, index[mask], t[mask], derivative=True))
+
+        pieces = (speed.reshape(count, steps, len(_gauss_nodes)) * _gauss_weights).sum(axis=2) / steps
+        table = np.zeros((count, steps + 1), dtype=np.float64)
+        np.cumsum(pieces, axis=1, out=table[:, 1:])
+        return table
+
+    def __evaluate_kind(self, kind: int, i: np.ndarray, t: np.ndarray, derivative: bool) -> np.ndarray:
+        """
+        Evaluates the point or the first derivative of segments that share the same kind
+        """
+        s = 1 - t
+        if kind == self.LINE:
+            if derivative:
+                return np.broadcast_to(self.end[i] - self.start[i], t.shape)
+            return self.start[i] + (self.end[i] - self.start[i]) * t
+        if kind == self.QUADRATIC:
+            if derivative:
+                return 2 * s * (self.c1[i] - self.start[i]) + 2 * t * (self.end[i] - self.c1[i])
+            return s * s * self.start[i] + 2 * s * t * self.c1[i] + t * t * self.end[i]
+        if kind == self.CUBIC:
+            if derivative:
+                return (3 * s * s * (self.c1[i] - self.start[i]) + 6 * s * t * (self.c2[i] - self.c1[i])
+                        + 3 * t * t * (self.end[i] - self.c2[i]))
+            return (s * s * s * self.start[i] + 3 * s * s * t * self.c1[i] + 3 * s * t * t * self.c2[i]
+                    + t * t * t * self.end[i])
+
+        # arc
+        angle = self.theta[i] + self.delta[i] * t
+        rotation = np.exp(1.0j * self.rotation[i])
+        radius = self.c2[i]
+        if derivative:
+            return rotation * (-np.sin(angle) * radius.real + 1.0j * np.cos(angle) * radius.imag) * self.delta[i]
+        return rotation * (np.cos(angle) * radius.real + 1.0j * np.sin(angle) * radius.imag) + self.c1[i]
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import argparse
+import io
+import os
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, NamedTuple
+
+from fourier.cli import analyse, auto_argument, non_negative_argument, non_negative_float_argument, \
+    positive_argument
+from fourier.svg_processor import SvgPath, epicycle_positions, select_frequencies
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+#### fixed palette, frames are drawn in palette mode so the gif encoder does not have to quantize them
+palette = [255, 255, 255, 0, 0, 0, 120, 120, 255, 0, 0, 255, 255, 0, 0]
+WHITE, BLACK, CIRCLE, ARROW, PEN = range(5)
+
+
+class Scene(NamedTuple):
+    """
+    Everything that is the same for all frames
+    """
+    width: int
+    height: int
+    scale: float
+    radii: List[np.ndarray]
+    traces: List[np.ndarray]
+    pen_radius: float
+
+
+def render_frames(scene: Scene, indices: range, positions: List[np.ndarray]) -> List[bytes]:
+    """
+    Rasterizes a chunk of frames
+    @param scene: data shared by all frames
+    @param indices: frame numbers of the chunk
+    @param positions: per chain the rows of epicycle_positions belonging to the chunk
+    @return: one png encoded image per frame
+    """
+    from PIL import Image, ImageDraw
+
+    ret = []
+    for row, index in enumerate(indices):
+        image = Image.new('P', (scene.width, scene.height), WHITE)
+        image.putpalette(palette)
+        draw = ImageDraw.Draw(image)
+        for chain, radii, trace in zip(positions, scene.radii, scene.traces):
+            points = chain[row] * scene.scale
+            if index > 0:
+                drawn = trace[:index + 1] * scene.scale
+                draw.line(list(zip(drawn.real.tolist(), drawn.imag.tolist())), fill=BLACK, width=1)
+
+            for center, tip, radius in zip(points[:-1].tolist(), points[1:].tolist(), (radii * scene.scale).tolist()):
+                if radius < 0.5:
+                    continue
+                draw.ellipse((center.real - radius, center.imag - radius, center.real + radius,
+                              center.imag + radius), outline=CIRCLE)
+                draw.line((center.real, center.imag, tip.real, tip.imag), fill=ARROW)
+
+            pen = points[-1]
+            r = scene.pen_radius * scene.scale
+            draw.ellipse((pen.real - r, pen.imag - r, pen.real + r, pen.imag + r), fill=PEN, outline=BLACK)
+
+        buffer = io.BytesIO()
+        image.save(buffer, format='PNG')
+        ret.append(buffer.getvalue())
+    return ret
+
+
+def rasterize(svg: SvgPath, harmonics: List[Dict[int, complex]], output: str, frames: int = 600,
+              scale: float = 1.0, fps: float = 30, workers: int = None, chunk_size: int = 25, top_k: int = None,
+              threshold: float = None):
+    """
+    Renders one period of the animation into a gif or a png sequence
+    The positions of all circles in all frames are evaluated up front, the frames are drawn in chunks on a process pool
+    @param svg: SvgPath object the coefficients belong to
+    @param harmonics: one set of calculated fourier coefficients per subpath
+    @param output: name of a .gif file, a png name pattern containing %d (e.g. frame%04d.png) or a directory
+    @param frames: number of frames per period
+    @param scale: pixels per unit of the drawing
+    @param fps: frames per second of the gif
+    @param workers: number of worker processes
+    @param chunk_size: number of frames drawn by one task
+    @param top_k: draw only the top_k strongest frequencies of every subpath
+    @param threshold: draw only frequencies whose amplitude is at least threshold * svg.width
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        raise ImportError('raster output needs Pillow (pip install Pillow)')
+    import numpy as np
+
+    times = np.arange(frames) / frames
+    positions = []
+    radii = []
+    for coefficients in harmonics:
+        frequencies = select_frequencies(coefficients, top_k=top_k,
+                                         threshold=threshold * svg.width if threshold is not None else None)
+        positions.append(epicycle_positions(coefficients, frequencies, times))
+        radii.append(np.array([abs(coefficients[f]) for f in frequencies]))
+
+    scene = Scene(int(round(svg.width * 1.2 * scale)), int(round(svg.height * 1.2 * scale)), scale, radii,
+                  [chain[:, -1] for chain in positions], svg.width / 200)
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        chunks = [range(start, min(start + chunk_size, frames)) for start in range(0, frames, chunk_size)]
+        futures = [executor.submit(render_frames, scene, chunk, [chain[chunk.start:chunk.stop] for chain in positions])
+                   for chunk in chunks]
+        images = (image for future in futures for image in future.result())
+
+        if output.endswith('.gif'):
+            first = Image.open(io.BytesIO(next(images)))
+            first.save(output, save_all=True, append_images=(Image.open(io.BytesIO(image)) for image in images),
+                       duration=int(round(1000 / fps)), loop=0, optimize=False)
+            return
+
+        if '%' not in output:
+            os.makedirs(output, exist_ok=True)
+            output = os.path.join(output, 'frame%04d.png')
+        for index, image in enumerate(images):
+            with open(output % index, 'wb') as fd:
+                fd.write(image)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='fourier-raster',
+                                     description='Renders the animation into a gif or png frames')
+    parser.add_argument('input_file')
+    parser.add_argument('output', help='.gif file, png name pattern like frame%%04d.png or directory')
+    parser.add_argument('number_of_harmonics', type=int)
+    parser.add_argument('--frames', type=int, default=600, help='frames per period (default: 600)')
+    parser.add_argument('--scale', type=float, default=1.0, help='pixels per unit of the drawing (default: 1)')
+    parser.add_argument('--fps', type=float, default=30, help='frames per second of a gif (default: 30)')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes')
+    parser.add_argument('--points', type=auto_argument, default=None,
+                        help='number of points sampled from every subpath or "auto" to choose it from the harmonics, '
+                             'the length and the curvature of the subpath (default: auto)')
+    parser.add_argument('--top-k', type=non_negative_argument, default=None,
+                        help='draw only the strongest frequencies, chained by decreasing amplitude')
+    parser.add_argument('--threshold', type=non_negative_float_argument, default=None,
+                        help='draw only frequencies with an amplitude of at least THRESHOLD * width of the drawing')
+    parser.add_argument('--max-paths', type=positive_argument, default=None,
+                        help='only draw the first MAX_PATHS paths of the drawing, the rest is not read')
+    args = parser.parse_args()
+
+    svg = SvgPath(args.input_file, max_paths=args.max_paths)
+    harmonics = [analyse(path_desc, args.number_of_harmonics, number_of_points=args.points, transform=transform)
+                 for path_desc, transform in svg.subpaths()]
+    rasterize(svg, harmonics, args.output, frames=args.frames, scale=args.scale, fps=args.fps, workers=args.workers,
+              top_k=args.top_k, threshold=args.threshold)
+    print("done\n")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+import argparse
+import json
+
+from typing import Optional
+
+from fourier.cli import non_negative_argument, non_negative_float_argument, positive_argument, print_size_report, \
+    write_result
+from fourier.coefficient_file import load_coefficients, select_coefficients
+from fourier.instrumentation import Stats, stage
+from fourier.svg_processor import SvgPath, layouts
+
+
+def render_coefficients(coefficients_file: str, output_file: str, number_of_harmonics: Optional[int] = None,
+                        input_file: str = None, top_k: int = None, threshold: float = None, layout: str = 'nested',
+                        keyframes: int = None, digits: int = None, decimals: int = None):
+    """
+    Draws coefficients saved with fourier --save-coefficients without sampling or transforming anything
+    @param coefficients_file: .npy or .npz file written by coefficient_file.save_coefficients
+    @param output_file: svg file to write the animation to, a name ending in .svgz is compressed while it is written
+    @param number_of_harmonics: Number of frequencies to draw per subpath, None for all saved ones
+    @param input_file: svg file the coefficients were calculated from, required for .npy files and used instead of
+                       the drawing stored in a .npz file if given
+    @param top_k: draw only the top_k strongest frequencies of every subpath
+    @param threshold: draw only frequencies whose amplitude is at least threshold * width of the drawing
+    @param layout: arrangement of the circles, see build_result
+    @param keyframes: number of keyframes per period of the flat layout
+    @param digits: number of significant digits of the written numbers, None for full precision
+    @param decimals: number of decimal places of the written numbers, used if digits is None
+    """
+    with stage('load') as record:
+        records, svg = load_coefficients(coefficients_file)
+        if input_file is not None:
+            svg = SvgPath(input_file)
+        if svg is None:
+            raise ValueError(coefficients_file + ' does not contain the drawing, pass the input svg file')
+        coefficients = select_coefficients(records, number_of_harmonics)
+        record['subpaths'] = len(coefficients)
+        record['harmonics'] = number_of_harmonics
+
+    write_result(svg, coefficients, output_file, top_k=top_k, threshold=threshold, layout=layout, keyframes=keyframes,
+                 digits=digits, decimals=decimals)
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='fourier-render')
+    parser.add_argument('coefficients_file', help='.npy or .npz file written by fourier --save-coefficients')
+    parser.add_argument('output_file')
+    parser.add_argument('number_of_harmonics', type=int, nargs='?', default=None,
+                        help='number of harmonics per subpath (default: all saved ones)')
+    parser.add_argument('--svg', dest='input_file',
+                        help='svg file the coefficients were calculated from, required for .npy files')
+    parser.add_argument('--top-k', type=non_negative_argument, default=None,
+                        help='draw only the strongest frequencies, chained by decreasing amplitude')
+    parser.add_argument('--threshold', type=non_negative_float_argument, default=None,
+                        help='draw only frequencies with an amplitude of at least THRESHOLD * width of the drawing')
+    parser.add_argument('--layout', choices=layouts, default='nested', help='arrangement of the circles')
+    parser.add_argument('--keyframes', type=positive_argument, default=None,
+                        help='keyframes per period of the flat layout')
+    parser.add_argument('--digits', type=int, default=None,
+                        help='significant digits of the numbers in the output (default: full precision)')
+    parser.add_argument('--decimals', type=int, default=None,
+                        help='decimal places of the numbers in the output, ignored if --digits is given')
+    parser.add_argument('--stats', action='store_true',
+                        help='print wall time, cpu time, peak memory and counts of every stage')
+    parser.add_argument('--stats-json', metavar='FILE', help='write the stage records to a json file')
+    args = parser.parse_args()
+
+    with Stats(trace_memory=args.stats or args.stats_json is not None) as stats:
+        render_coefficients(args.coefficients_file, args.output_file, args.number_of_harmonics,
+                            input_file=args.input_file, top_k=args.top_k, threshold=args.threshold,
+                            layout=args.layout, keyframes=args.keyframes, digits=args.digits,
+                            decimals=args.decimals)
+
+    if args.stats:
+        stats.print()
+    print_size_report(stats.records)
+    if args.stats_json is not None:
+        with open(args.stats_json, mode='w') as fd:
+            json.dump({'coefficients_file': args.coefficients_file, 'output_file': args.output_file,
+                       'stages': stats.records}, fd, indent=1)
+
+
+if __name__ == '__main__':
+    main()
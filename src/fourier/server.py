@@ -0,0 +1,332 @@
+import argparse
+import asyncio
+import base64
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import sys
+
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import NamedTuple, Optional
+from xml.etree import ElementTree
+
+from fourier.cli import analyse, backends
+from fourier.svg_processor import SvgPath, draw_result, layouts, samplings
+
+reasons = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large',
+           500: 'Internal Server Error', 503: 'Service Unavailable', 504: 'Gateway Timeout'}
+
+
+class Parameters(NamedTuple):
+    harmonics: int = 100
+    points: Optional[int] = None
+    sampling: str = 'parameter'
+    backend: str = 'fft'
+    top_k: Optional[int] = None
+    threshold: Optional[float] = None
+    layout: str = 'nested'
+    keyframes: Optional[int] = None
+    digits: Optional[int] = None
+    decimals: Optional[int] = None
+    max_paths: Optional[int] = None
+
+
+class RequestError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_parameters(fields: dict) -> Parameters:
+    """
+    Checks the parameters of a request
+    @param fields: json object of the request without the svg
+    @return: parameters with defaults for the missing ones
+    """
+    if fields.get('points') == 'auto':
+        fields = dict(fields, points=None)
+    unknown = set(fields) - set(Parameters._fields)
+    if len(unknown) != 0:
+        raise RequestError(400, 'unknown parameters: ' + ', '.join(sorted(unknown)))
+    types = {'threshold': (int, float), 'sampling': str, 'backend': str, 'layout': str}
+    for name, value in fields.items():
+        if isinstance(value, bool) or (value is not None and not isinstance(value, types.get(name, int))):
+            raise RequestError(400, 'invalid value of ' + name + ': ' + repr(value))
+
+    parameters = Parameters(**fields)
+    for name, choices in (('sampling', samplings), ('backend', backends), ('layout', layouts)):
+        if getattr(parameters, name) not in choices:
+            raise RequestError(400, name + ' has to be one of ' + ', '.join(choices))
+    if parameters.harmonics is None or parameters.harmonics < 0:
+        raise RequestError(400, 'harmonics has to be 0 or more')
+    if parameters.points is not None and parameters.points < 1:
+        raise RequestError(400, 'points has to be positive or "auto"')
+    if parameters.max_paths is not None and parameters.max_paths < 1:
+        raise RequestError(400, 'max_paths has to be positive')
+    for name in ('top_k', 'threshold'):
+        if getattr(parameters, name) is not None and getattr(parameters, name) < 0:
+            raise RequestError(400, name + ' has to be 0 or more')
+    return parameters
+
+
+def render_content(content: bytes, parameters: Parameters) -> str:
+    """
+    Runs the pipeline on the content of an svg file, called in the worker processes
+    @return: the animation in svg format
+    """
+    svg = SvgPath(io.BytesIO(content), max_paths=parameters.max_paths)
+    coefficients = [analyse(path_desc, parameters.harmonics, number_of_points=parameters.points,
+                            sampling=parameters.sampling, backend=parameters.backend, transform=transform)
+                    for path_desc, transform in svg.subpaths()]
+    return draw_result(svg, coefficients, top_k=parameters.top_k, threshold=parameters.threshold,
+                       layout=parameters.layout, keyframes=parameters.keyframes, digits=parameters.digits,
+                       decimals=parameters.decimals)
+
+
+class ResultCache:
+    """
+    Least recently used results in memory, bounded by their total size
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.__entries = OrderedDict()
+
+    @staticmethod
+    def key(content: bytes, parameters: Parameters) -> str:
+        digest = hashlib.sha256(content)
+        digest.update(b'\0' + json.dumps(parameters._asdict(), sort_keys=True).encode('ascii'))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[bytes]:
+        result = self.__entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.__entries.move_to_end(key)
+        return result
+
+    def put(self, key: str, result: bytes):
+        if len(result) > self.max_bytes:
+            return
+        if key in self.__entries:
+            self.size -= len(self.__entries.pop(key))
+        self.__entries[key] = result
+        self.size += len(result)
+        while self.size > self.max_bytes:
+            _, evicted = self.__entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def __len__(self):
+        return len(self.__entries)
+
+
+class RenderServer:
+    """
+    HTTP server rendering svg files sent to it
+    POST /render takes a json object with the svg file as "svg" (text) or "svg_base64" and the parameters of
+    Parameters, and answers with the animation. Identical requests are answered from the cache, identical requests
+    arriving while the first one is rendered wait for it. GET /status reports the counters of the server
+    """
+
+    def __init__(self, executor: ProcessPoolExecutor, cache: ResultCache, max_concurrent: int = 4,
+                 max_queued: int = 64, timeout: float = 60.0, max_body: int = 16 * 2 ** 20):
+        """
+        @param executor: pool the pipeline runs on. Its workers must not be forked from this process, they would
+                         inherit the sockets of the open connections and keep them from being closed
+        @param cache: cache of finished results
+        @param max_concurrent: number of renderings submitted to the pool at the same time
+        @param max_queued: number of renderings waiting for a slot, further requests are answered with 503
+        @param timeout: seconds a request may take including the wait for a slot, answered with 504 afterwards
+        @param max_body: maximum size of a request body in bytes
+        """
+        self.executor = executor
+        self.cache = cache
+        self.timeout = timeout
+        self.max_body = max_body
+        self.max_queued = max_queued
+        self.max_concurrent = max_concurrent
+        # created in the event loop of the first request
+        self.__slots = None
+        self.__waiting = 0
+        self.__running = {}
+        self.requests = 0
+        self.errors = 0
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.requests += 1
+        try:
+            try:
+                method, target, body = await self.__read_request(reader)
+                status, content_type, payload = await self.__dispatch(method, target, body)
+            except RequestError as e:
+                status, content_type, payload = e.status, 'text/plain', (str(e) + '\n').encode('utf-8')
+            if status != 200:
+                self.errors += 1
+            writer.write(b'HTTP/1.1 %d %s\r\nContent-Type: %s\r\nContent-Length: %d\r\nConnection: close\r\n\r\n'
+                         % (status, reasons[status].encode('ascii'), content_type.encode('ascii'), len(payload)))
+            writer.write(payload)
+            await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def __read_request(self, reader: asyncio.StreamReader):
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), self.timeout)
+        except asyncio.LimitOverrunError:
+            raise RequestError(413, 'request header too large')
+        except asyncio.TimeoutError:
+            raise RequestError(400, 'incomplete request')
+        lines = head.decode('latin-1').split('\r\n')
+        parts = lines[0].split(' ')
+        if len(parts) != 3:
+            raise RequestError(400, 'malformed request line')
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length', '0'))
+        except ValueError:
+            raise RequestError(400, 'invalid content length')
+        if length > self.max_body:
+            raise RequestError(413, 'request body larger than ' + str(self.max_body) + ' bytes')
+        body = await asyncio.wait_for(reader.readexactly(length), self.timeout) if length > 0 else b''
+        return parts[0], parts[1], body
+
+    async def __dispatch(self, method: str, target: str, body: bytes):
+        path = target.split('?', 1)[0]
+        if path == '/status':
+            if method != 'GET':
+                raise RequestError(405, 'use GET')
+            status = {'requests': self.requests, 'errors': self.errors, 'running': len(self.__running),
+                      'waiting': self.__waiting, 'cached': len(self.cache), 'cache_bytes': self.cache.size,
+                      'cache_hits': self.cache.hits, 'cache_misses': self.cache.misses}
+            return 200, 'application/json', json.dumps(status).encode('utf-8')
+        if path != '/render':
+            raise RequestError(404, 'unknown path ' + path)
+        if method != 'POST':
+            raise RequestError(405, 'use POST')
+
+        try:
+            fields = json.loads(body.decode('utf-8'))
+        except ValueError as e:
+            raise RequestError(400, 'invalid json: ' + str(e))
+        if not isinstance(fields, dict):
+            raise RequestError(400, 'expected a json object')
+        if 'svg_base64' in fields:
+            try:
+                content = base64.b64decode(fields.pop('svg_base64'), validate=True)
+            except (ValueError, TypeError):
+                raise RequestError(400, 'invalid base64 in svg_base64')
+        elif isinstance(fields.get('svg'), str):
+            content = fields.pop('svg').encode('utf-8')
+        else:
+            raise RequestError(400, 'the request needs the svg file as "svg" or "svg_base64"')
+        parameters = parse_parameters(fields)
+
+        try:
+            result = await asyncio.wait_for(self.render(content, parameters), self.timeout)
+        except asyncio.TimeoutError:
+            raise RequestError(504, 'rendering took longer than ' + str(self.timeout) + 's')
+        return 200, 'image/svg+xml', result
+
+    async def render(self, content: bytes, parameters: Parameters) -> bytes:
+        """
+        Returns the cached result or renders it on the pool, at most max_concurrent at a time
+        """
+        key = self.cache.key(content, parameters)
+        result = self.cache.get(key)
+        if result is not None:
+            return result
+
+        running = self.__running.get(key)
+        if running is None:
+            if self.__waiting >= self.max_queued:
+                raise RequestError(503, 'too many requests waiting')
+            running = asyncio.ensure_future(self.__render(key, content, parameters))
+            self.__running[key] = running
+            running.add_done_callback(lambda task: self.__finished(key, task))
+        # a timed out request must not cancel the rendering other requests wait for
+        return await asyncio.shield(running)
+
+    def __finished(self, key: str, task: asyncio.Future):
+        self.__running.pop(key, None)
+        if not task.cancelled():
+            # retrieved here in case every request waiting for it timed out
+            task.exception()
+
+    async def __render(self, key: str, content: bytes, parameters: Parameters) -> bytes:
+        if self.__slots is None:
+            self.__slots = asyncio.Semaphore(self.max_concurrent)
+        self.__waiting += 1
+        try:
+            await self.__slots.acquire()
+        finally:
+            self.__waiting -= 1
+        try:
+            loop = asyncio.get_running_loop()
+            try:
+                text = await loop.run_in_executor(self.executor, render_content, content, parameters)
+            except (ValueError, ElementTree.ParseError) as e:
+                # malformed svg files and parameters the pipeline rejects are errors of the request
+                raise RequestError(400, type(e).__name__ + ': ' + str(e))
+            except Exception as e:
+                raise RequestError(500, type(e).__name__ + ': ' + str(e))
+        finally:
+            self.__slots.release()
+        result = text.encode('utf-8')
+        self.cache.put(key, result)
+        return result
+
+
+async def serve(host: str, port: int, server: RenderServer):
+    listener = await asyncio.start_server(server.handle, host, port, limit=2 ** 16)
+    print('listening on http://%s:%d' % (host, listener.sockets[0].getsockname()[1]))
+    sys.stdout.flush()
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(prog='fourier-server', description='Renders svg files sent to it over http')
+    parser.add_argument('--host', default='127.0.0.1', help='address to listen on (default: 127.0.0.1)')
+    parser.add_argument('--port', type=int, default=8080, help='port to listen on, 0 picks a free one (default: 8080)')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of worker processes (default: number of cpus)')
+    parser.add_argument('--concurrent', type=int, default=None,
+                        help='renderings running at the same time (default: number of workers)')
+    parser.add_argument('--queue', type=int, default=64,
+                        help='renderings waiting for a worker before requests are rejected (default: 64)')
+    parser.add_argument('--timeout', type=float, default=60,
+                        help='seconds until a request is answered with 504 (default: 60)')
+    parser.add_argument('--cache-size', type=float, default=256,
+                        help='maximum size of the cached results in MiB (default: 256)')
+    parser.add_argument('--max-body', type=float, default=16,
+                        help='maximum size of a request in MiB (default: 16)')
+    args = parser.parse_args()
+
+    workers = args.workers if args.workers is not None else os.cpu_count() or 1
+    concurrent = args.concurrent if args.concurrent is not None else workers
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        server = RenderServer(executor, ResultCache(int(args.cache_size * 2 ** 20)), max_concurrent=concurrent,
+                              max_queued=args.queue, timeout=args.timeout, max_body=int(args.max_body * 2 ** 20))
+        try:
+            asyncio.run(serve(args.host, args.port, server))
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,603 @@
+from __future__ import annotations
+
+import cmath
+import functools
+import math
+import re
+import warnings
+
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Tuple, Union
+from xml.etree import ElementTree
+
+from fourier.instrumentation import stage
+from fourier.svg_visitor.svg_visitor import AnimateMotion, AnimateTransform, Circle, FormatVisitor, Group, LazyGroup, \
+    Line, NumberFormat, Path, Svg, Use
+
+if TYPE_CHECKING:
+    import numpy as np
+
+duration = 20
+samplings = ('parameter', 'arclength')
+layouts = ('nested', 'flat', 'shared')
+
+Transform = Tuple[float, float, float, float, float, float]
+
+
+class SvgPath:
+    """
+    Represents a Svg-Path
+    """
+
+    def __init__(self, file_path, max_paths: int = None):
+        """
+        Streams the document with an xml parser, only the root element and the path elements are kept
+        Paths inside containers that are not rendered directly (defs, symbol, ...) are skipped, a warning is issued if
+        the document draws such content with <use>
+        :param file_path: path of the svg file or a binary file object
+        :param max_paths: stop reading the document once this many paths were found
+        """
+        self.width = None
+        self.height = None
+        self.view_box = None
+        self.paths = []
+        self.transforms = []
+
+        # transformation of every open element, the root has none
+        stack = [None]
+        hidden = 0
+        skipped = 0
+        uses = 0
+        for event, elem in ElementTree.iterparse(file_path, events=('start', 'end')):
+            tag = elem.tag.rsplit('}', 1)[-1]
+            if event == 'start':
+                if tag == 'svg' and self.width is None:
+                    self.__read_dimensions(elem)
+                if tag in hidden_containers:
+                    hidden += 1
+                stack.append(multiply_transforms(stack[-1], parse_transform(elem.get('transform'))))
+
+                if tag == 'use':
+                    uses += 1
+                if tag == 'path' and hidden != 0:
+                    skipped += 1
+                elif tag == 'path' and elem.get('d', '').strip() != '':
+                    self.paths.append(elem.get('d').strip())
+                    self.transforms.append(stack[-1])
+                    if max_paths is not None and len(self.paths) >= max_paths:
+                        break
+            else:
+                stack.pop()
+                if tag in hidden_containers:
+                    hidden -= 1
+                elem.clear()
+
+        if skipped != 0 and uses != 0:
+            warnings.warn(str(skipped) + ' paths inside ' + ', '.join(hidden_containers) + ' were skipped, shapes '
+                          'drawn through <use> are not animated', stacklevel=2)
+        if self.width is None:
+            raise ValueError('no svg element with width and height or viewBox found')
+        if len(self.paths) == 0:
+            raise ValueError('no path found')
+        self.path = self.paths[0]
+        self.transform = self.transforms[0]
+
+    @classmethod
+    def from_paths(cls, width: float, height: float, paths: List[str], transforms: List[Optional[Transform]],
+                   view_box: Tuple[float, float, float, float] = None) -> 'SvgPath':
+        """
+        Creates the drawing from already parsed data instead of a file
+        :param width: width of the drawing in user units
+        :param height: height of the drawing in user units
+        :param paths: path descriptions
+        :param transforms: transformation of every path, None for the identity
+        :param view_box: optional view box of the drawing
+        """
+        if len(paths) == 0:
+            raise ValueError('no path found')
+        svg = cls.__new__(cls)
+        svg.width = width
+        svg.height = height
+        svg.view_box = view_box
+        svg.paths = list(paths)
+        svg.transforms = list(transforms)
+        svg.path = svg.paths[0]
+        svg.transform = svg.transforms[0]
+        return svg
+
+    def __read_dimensions(self, elem):
+        view_box = elem.get('viewBox')
+        if view_box is not None:
+            self.view_box = tuple(float(number) for number in re.split(r'[\s,]+', view_box.strip()))
+
+        width = parse_length(elem.get('width'))
+        height = parse_length(elem.get('height'))
+        if width is None or height is None or (self.view_box is not None and (width[1] or height[1])):
+            # the path coordinates are in user units, so the view box wins over absolute units
+            if self.view_box is None:
+                raise ValueError('svg element without usable width and height or viewBox')
+            self.width = self.view_box[2]
+            self.height = self.view_box[3]
+        else:
+            self.width = width[0]
+            self.height = height[0]
+
+    def subpaths(self) -> List[Tuple[str, Optional[Transform]]]:
+        """
+        Splits all paths of the document into their subpaths
+        :return: list of path descriptions, each starting with a move command, with the transformation of the path
+        """
+        return [(subpath, transform) for path_desc, transform in zip(self.paths, self.transforms)
+                for subpath in split_subpaths(path_desc)]
+
+
+# elements whose content is not rendered directly
+hidden_containers = ('defs', 'symbol', 'clipPath', 'mask', 'pattern', 'marker')
+
+# size of the absolute units in px
+units = {'': 1.0, 'px': 1.0, 'pt': 4 / 3, 'pc': 16.0, 'mm': 96 / 25.4, 'cm': 96 / 2.54, 'in': 96.0}
+
+re_number = r'[-+]?(?:[0-9]+\.?[0-9]*|\.[0-9]+)(?:[eE][-+]?[0-9]+)?'
+
+
+def parse_length(value: Optional[str]) -> Optional[Tuple[float, bool]]:
+    """
+    Parses a svg length
+    :param value: attribute value, e.g. "12.5", "300px" or "210mm"
+    :return: (length in px, whether the value had an unit other than px) or None for missing or relative lengths
+    """
+    if value is None:
+        return None
+    match = re.fullmatch(r'\s*(' + re_number + r')\s*([a-z]*)\s*', value)
+    if match is None or match.group(2) not in units:
+        return None
+    unit = match.group(2)
+    return float(match.group(1)) * units[unit], unit not in ('', 'px')
+
+
+def parse_transform(value: Optional[str]) -> Optional[Transform]:
+    """
+    Parses a svg transform attribute
+    :param value: attribute value, e.g. "translate(10 20) rotate(45)"
+    :return: affine matrix (a, b, c, d, e, f) as in matrix(a b c d e f), None for a missing attribute
+    """
+    if value is None or value.strip() == '':
+        return None
+
+    ret = None
+    for name, args in re.findall(r'([A-Za-z]+)\s*\(([^)]*)\)', value):
+        numbers = [float(number) for number in re.findall(re_number, args)]
+        if name == 'matrix' and len(numbers) == 6:
+            matrix = tuple(numbers)
+        elif name == 'translate' and len(numbers) in (1, 2):
+            matrix = (1.0, 0.0, 0.0, 1.0, numbers[0], numbers[1] if len(numbers) == 2 else 0.0)
+        elif name == 'scale' and len(numbers) in (1, 2):
+            matrix = (numbers[0], 0.0, 0.0, numbers[-1], 0.0, 0.0)
+        elif name == 'rotate' and len(numbers) in (1, 3):
+            angle = math.radians(numbers[0])
+            matrix = (math.cos(angle), math.sin(angle), -math.sin(angle), math.cos(angle), 0.0, 0.0)
+            if len(numbers) == 3:
+                matrix = multiply_transforms(multiply_transforms((1.0, 0.0, 0.0, 1.0, numbers[1], numbers[2]), matrix),
+                                             (1.0, 0.0, 0.0, 1.0, -numbers[1], -numbers[2]))
+        elif name == 'skewX' and len(numbers) == 1:
+            matrix = (1.0, 0.0, math.tan(math.radians(numbers[0])), 1.0, 0.0, 0.0)
+        elif name == 'skewY' and len(numbers) == 1:
+            matrix = (1.0, math.tan(math.radians(numbers[0])), 0.0, 1.0, 0.0, 0.0)
+        else:
+            raise ValueError('invalid transform "' + name + '(' + args + ')"')
+        ret = multiply_transforms(ret, tuple(float(number) for number in matrix))
+    return ret
+
+
+def multiply_transforms(first: Optional[Transform], second: Optional[Transform]) -> Optional[Transform]:
+    """
+    Concatenates two affine transformations, second is applied first like in "transform=first second"
+    None stands for the identity
+    """
+    if first is None:
+        return second
+    if second is None:
+        return first
+    a1, b1, c1, d1, e1, f1 = first
+    a2, b2, c2, d2, e2, f2 = second
+    return (a1 * a2 + c1 * b2, b1 * a2 + d1 * b2,
+            a1 * c2 + c1 * d2, b1 * c2 + d1 * d2,
+            a1 * e2 + c1 * f2 + e1, b1 * e2 + d1 * f2 + f1)
+
+
+def format_transform(transform: Optional[Transform]) -> Optional[str]:
+    """
+    Formats an affine transformation as svg attribute value
+    """
+    if transform is None:
+        return None
+    return 'matrix(' + ' '.join(str(number) for number in transform) + ')'
+
+
+def split_subpaths(path_desc: str) -> List[str]:
+    """
+    Splits a path description at its move commands
+    Relative coordinates are resolved, so every returned description can be used on its own
+    :param path_desc: path description in string format
+    :return: list of path descriptions
+    """
+    from svg.path import parse_path, Move, Path as SvgPathSegments
+
+    subpaths = []
+    segments = []
+    for segment in parse_path(path_desc):
+        if isinstance(segment, Move):
+            if len(segments) != 0:
+                subpaths.append(SvgPathSegments(*segments).d())
+            segments = [segment]
+        else:
+            segments.append(segment)
+    if any(not isinstance(segment, Move) for segment in segments):
+        subpaths.append(SvgPathSegments(*segments).d())
+    return subpaths
+
+
+def determine_points(path_desc: str, number_of_points: Optional[int], sampling: str = 'parameter',
+                     transform: Optional[Transform] = None, number_of_harmonics: Optional[int] = None) -> np.ndarray:
+    """
+    Extracts points from a given description of a svg-Path, see path_sampling.determine_points
+    numpy and svg.path are only imported once the first path is sampled
+    """
+    from fourier import path_sampling
+
+    return path_sampling.determine_points(path_desc, number_of_points, sampling=sampling, transform=transform,
+                                          number_of_harmonics=number_of_harmonics)
+
+
+def draw_result(svg: SvgPath, harmonics: Union[Dict[int, complex], List[Dict[int, complex]]], out=None,
+                top_k: int = None, threshold: float = None, layout: str = 'nested', keyframes: int = None,
+                digits: int = None, decimals: int = None):
+    """
+    Draws circles and arrows representing the fourier series on top of the svg-Path
+    :param svg: SvgPath object to draw on
+    :param harmonics: calculated fourier coefficients, or a list of them with one entry per subpath
+    :param out: optional file object, the result is then written to it while it is formatted instead of being
+                collected into one string. The circles are created while they are formatted, so only the groups
+                that are still open are held, not the whole drawing
+    :param top_k: draw only the top_k strongest frequencies of every series, chained by decreasing amplitude
+    :param threshold: draw only frequencies whose amplitude is at least threshold * svg.width, chained by decreasing
+                      amplitude
+    :param layout: 'nested', 'flat' or 'shared', see build_result
+    :param keyframes: number of keyframes per period of the flat layout
+    :param digits: number of significant digits of the written numbers, None for full precision
+    :param decimals: number of decimal places of the written numbers, used if digits is None
+    :return: string in svg-format, None if out is given
+    """
+    with stage('build') as record:
+        d = build_result(svg, harmonics, top_k=top_k, threshold=threshold, layout=layout, keyframes=keyframes)
+        record['subpaths'] = len(harmonics) if not isinstance(harmonics, dict) else 1
+
+    with stage('format') as record:
+        visitor = FormatVisitor(out, NumberFormat(digits, decimals))
+        d.accept(visitor)
+        result = visitor.formatted() if out is None else None
+        record['elements'] = visitor.element_count
+        record['output_bytes'] = visitor.size()
+    return result
+
+
+def build_result(svg: SvgPath, harmonics: Union[Dict[int, complex], List[Dict[int, complex]]], top_k: int = None,
+                 threshold: float = None, layout: str = 'nested', keyframes: int = None) -> Svg:
+    """
+    Builds the element tree of the animation drawn by draw_result
+    :param svg: SvgPath object to draw on
+    :param harmonics: calculated fourier coefficients, or a list of them with one entry per subpath
+    :param top_k: draw only the top_k strongest frequencies of every series
+    :param threshold: draw only frequencies whose amplitude is at least threshold * svg.width
+    :param layout: 'nested' chains the circles through nested groups following each other with animateMotion,
+                   'flat' places every circle directly below one group with a precomputed keyframed translation
+                   'shared' nests like 'nested' but draws and follows one shared unit circle per direction, scaled to
+                   the amplitude of every frequency
+    :param keyframes: number of keyframes per period of the flat layout
+    :return: Svg element
+    """
+    if isinstance(harmonics, dict):
+        harmonics = [harmonics]
+
+    d = Svg(svg.width * 1.2, svg.height * 1.2)
+
+    ####################################################################################################################
+    # draw original paths
+    ####################################################################################################################
+
+    for path_desc, transform in zip(svg.paths, svg.transforms):
+        presentation_attr = 'stroke="black" fill="none"'
+        if transform is not None:
+            presentation_attr += ' transform="' + format_transform(transform) + '"'
+        path = Path(
+            presentation_attr=presentation_attr)
+        path.set_path(path_desc)
+        d.append(path)
+
+    ####################################################################################################################
+    # draw one set of circles and arrows per subpath
+    ####################################################################################################################
+
+    unit_circles = None
+    if layout == 'shared':
+        unit_circles = {direction: __circle_to_path(0, 0, 1, direction=direction,
+                                                    presentation_attr='stroke="blue" fill="none" stroke-width="0.5" '
+                                                                      'stroke-dasharray="1,1" '
+                                                                      'vector-effect="non-scaling-stroke"')
+                        for direction in (0, 1)}
+        for direction, circle in unit_circles.items():
+            circle.id = 'unit' + str(direction)
+
+    for k, coefficients in enumerate(harmonics):
+        prefix = '' if k == 0 else 'p' + str(k) + '_'
+        frequencies = select_frequencies(coefficients, top_k=top_k,
+                                         threshold=threshold * svg.width if threshold is not None else None)
+        if layout == 'nested':
+            d.append(__draw_epicycles(svg, coefficients, prefix, frequencies))
+        elif layout == 'flat':
+            d.append(__draw_epicycles_flat(svg, coefficients, prefix, frequencies, keyframes))
+        elif layout == 'shared':
+            d.append(__draw_epicycles_shared(svg, coefficients, prefix, frequencies, unit_circles))
+        else:
+            raise ValueError('unknown layout "' + str(layout) + '", expected one of ' + ', '.join(layouts))
+
+    return d
+
+
+def select_frequencies(harmonics: Dict[int, complex], top_k: int = None, threshold: float = None) -> List[int]:
+    """
+    Chooses the frequencies to draw and the order in which their circles are chained
+    Without a limit all frequencies are chained by increasing absolute value, negative before positive. With top_k or
+    threshold only the strongest ones are kept and chained by decreasing amplitude
+    :param harmonics: calculated fourier coefficients
+    :param top_k: maximum number of frequencies to keep
+    :param threshold: minimum amplitude to keep
+    :return: list of frequencies, 0 is never part of it
+    """
+    if top_k is not None and top_k < 0:
+        raise ValueError('top_k has to be 0 or more, got ' + str(top_k))
+    end = len(harmonics) // 2
+    frequencies = [f for i in range(1, end + 1) for f in (-i, i) if f in harmonics]
+    if top_k is None and threshold is None:
+        return frequencies
+
+    if threshold is not None:
+        frequencies = [f for f in frequencies if abs(harmonics[f]) >= threshold]
+    frequencies = sorted(frequencies, key=lambda f: -abs(harmonics[f]))
+    if top_k is not None:
+        frequencies = frequencies[:top_k]
+    return frequencies
+
+
+def epicycle_positions(harmonics: Dict[int, complex], frequencies: List[int], times: np.ndarray) -> np.ndarray:
+    """
+    Evaluates the chain of circles for all points in time at once
+    :param harmonics: calculated fourier coefficients
+    :param frequencies: frequencies in the order they are chained, see select_frequencies
+    :param times: points in time as fractions of the period
+    :return: array (times x len(frequencies) + 1), column 0 is c_0, column k the tip of the k-th arrow
+    """
+    import numpy as np
+
+    return np.stack(list(epicycle_chain(harmonics, frequencies, times)), axis=1)
+
+
+def epicycle_chain(harmonics: Dict[int, complex], frequencies: List[int], times: np.ndarray) -> Iterator[np.ndarray]:
+    """
+    Evaluates the chain of circles one link after the other, only the current partial sum is kept
+    :param harmonics: calculated fourier coefficients
+    :param frequencies: frequencies in the order they are chained, see select_frequencies
+    :param times: points in time as fractions of the period
+    :return: c_0 and then the tip of every arrow for all points in time, see epicycle_positions
+    """
+    import numpy as np
+
+    position = np.full(len(times), harmonics[0], dtype=np.complex128)
+    yield position
+    for f in frequencies:
+        position = position + harmonics[f] * np.exp(-2j * np.pi * f * times)
+        yield position
+
+
+def __draw_epicycles(svg: SvgPath, harmonics: Dict[int, complex], prefix: str, frequencies: List[int]) -> Group:
+    """
+    Draws the animated circles and arrows of one fourier series
+    Every circle is drawn in its own group that moves along the circle of the previous frequency. The groups are
+    created while they are visited, a visitor writing to a file only holds the groups it is inside of
+    :param svg: SvgPath object to draw on
+    :param harmonics: calculated fourier coefficients
+    :param prefix: prefix of the group ids, keeps them unique if several series are drawn
+    :param frequencies: frequencies to draw in the order they are chained, see select_frequencies
+    :return: outermost group
+    """
+    if len(frequencies) == 0:
+        group = Group(transform=('translate', harmonics[0].real, harmonics[0].imag))
+        group.append_element(Circle(svg.width / 200, 0, 0, presentation_attr='stroke="black" fill="red"'))
+        return group
+
+    def chain(k: int):
+        # the group of the k-th frequency moves along the circle of the previous one, contains the circle of its own
+        # frequency and the group of the next one, the last one carries the pen
+        f = frequencies[k]
+        if k != 0:
+            yield __motion(harmonics, frequencies[k - 1], prefix + 'r' + str(frequencies[k - 1]))
+
+        amplitude = abs(harmonics[f])
+        circle = __circle_to_path(0, 0, amplitude, direction=1 if f < 0 else 0,
+                                  presentation_attr='stroke="blue" fill="none" stroke-width="0.5" '
+                                                    'stroke-dasharray="1,1"')
+        circle.id = prefix + 'r' + str(f)
+        group = Group(id=prefix + 'c' + str(f))
+        group.append_element(circle)
+        group.append_element(Line(0, 0, amplitude, 0, presentation_attr='stroke="blue" fill="none" stroke-width="0.5"'))
+        group.append_animation(__rotation(harmonics, f))
+        yield group
+
+        if k + 1 < len(frequencies):
+            yield LazyGroup(functools.partial(chain, k + 1), id=prefix + 'a' + str(frequencies[k + 1]))
+        else:
+            c = Circle(svg.width / 200, 0, 0, presentation_attr='stroke="black" fill="red"')
+            c.append_animation(__motion(harmonics, f, circle.id))
+            yield c
+
+    return LazyGroup(functools.partial(chain, 0), id=prefix + 'a' + str(frequencies[0]),
+                     transform=('translate', harmonics[0].real, harmonics[0].imag))
+
+
+def __draw_epicycles_shared(svg: SvgPath, harmonics: Dict[int, complex], prefix: str, frequencies: List[int],
+                            unit_circles: Dict[int, Path]) -> Group:
+    """
+    Draws the animated circles and arrows of one fourier series nested like __draw_epicycles, but without a path of
+    its own per frequency
+    Every circle is a <use> of the unit circle of its direction scaled to the amplitude. The group following a circle
+    moves along the same unit circle inside a group scaled by the amplitude and undoes the scaling for its content.
+    These two scales are not rounded by the number format
+    :param svg: SvgPath object to draw on
+    :param harmonics: calculated fourier coefficients
+    :param prefix: prefix of the group ids, keeps them unique if several series are drawn
+    :param frequencies: frequencies to draw in the order they are chained, see select_frequencies
+    :param unit_circles: circles of radius 1 around the origin by direction, 1 for negative frequencies
+    :return: outermost group
+    """
+    if len(frequencies) == 0:
+        group = Group(transform=('translate', harmonics[0].real, harmonics[0].imag))
+        group.append_element(Circle(svg.width / 200, 0, 0, presentation_attr='stroke="black" fill="red"'))
+        return group
+
+    def follow(f: int, inner):
+        yield __motion(harmonics, f, unit_circles[1 if f < 0 else 0])
+        yield inner
+
+    def chain(k: int):
+        f = frequencies[k]
+        amplitude = abs(harmonics[f])
+        group = Group(id=prefix + 'c' + str(f))
+        group.append_element(Use(unit_circles[1 if f < 0 else 0], transform=('scale', amplitude)))
+        group.append_element(Line(0, 0, amplitude, 0, presentation_attr='stroke="blue" fill="none" stroke-width="0.5"'))
+        group.append_animation(__rotation(harmonics, f))
+        yield group
+
+        if k + 1 < len(frequencies):
+            inner = LazyGroup(functools.partial(chain, k + 1), id=prefix + 'a' + str(frequencies[k + 1]))
+        else:
+            inner = Circle(svg.width / 200, 0, 0, presentation_attr='stroke="black" fill="red"')
+        if amplitude > 0:
+            # written with full precision, rounded separately the two scales would not cancel and the error would
+            # grow with every level
+            carrier = Group(transform='scale(' + repr(amplitude) + ')')
+            carrier.append_element(LazyGroup(functools.partial(follow, f, inner),
+                                             transform='scale(' + repr(1 / amplitude) + ')'))
+            inner = carrier
+        yield inner
+
+    return LazyGroup(functools.partial(chain, 0), id=prefix + 'a' + str(frequencies[0]),
+                     transform=('translate', harmonics[0].real, harmonics[0].imag))
+
+
+def __draw_epicycles_flat(svg: SvgPath, harmonics: Dict[int, complex], prefix: str, frequencies: List[int],
+                          keyframes: int = None) -> Group:
+    """
+    Draws the animated circles and arrows of one fourier series without nesting
+    The center of every circle is the partial sum of the previous frequencies, it is precomputed for one period and
+    animated as keyframed translation of a group directly below the returned one. The pen follows the precomputed
+    trajectory of the whole sum. The circles are created while the returned group is visited, one partial sum at a
+    time
+    :param svg: SvgPath object to draw on
+    :param harmonics: calculated fourier coefficients
+    :param prefix: prefix of the group ids, keeps them unique if several series are drawn
+    :param frequencies: frequencies to draw in the order they are chained, see select_frequencies
+    :param keyframes: number of keyframes per period, by default 8 per turn of the fastest circle
+    :return: group containing all circles
+    """
+    if keyframes is not None and keyframes < 1:
+        raise ValueError('keyframes has to be at least 1, got ' + str(keyframes))
+
+    if len(frequencies) == 0:
+        container = Group(id=prefix + 'epicycles')
+        container.append_element(Circle(svg.width / 200, harmonics[0].real, harmonics[0].imag,
+                                        presentation_attr='stroke="black" fill="red"'))
+        return container
+
+    if keyframes is None:
+        keyframes = min(max(8 * max(abs(f) for f in frequencies), 64), 4096)
+
+    def circles():
+        import numpy as np
+
+        # partial sums over one period, the k-th one is the center of the k-th circle and the tip of the previous arrow
+        times = np.arange(keyframes + 1) / keyframes
+        positions = epicycle_chain(harmonics, frequencies, times)
+        for i, center in zip(frequencies, positions):
+            amplitude = abs(harmonics[i])
+            group = Group(id=prefix + 'c' + str(i))
+            group.append_element(__circle_to_path(0, 0, amplitude, direction=1 if i < 0 else 0,
+                                                  presentation_attr='stroke="blue" fill="none" stroke-width="0.5" '
+                                                                    'stroke-dasharray="1,1"'))
+            group.append_element(Line(0, 0, amplitude, 0,
+                                      presentation_attr='stroke="blue" fill="none" stroke-width="0.5"'))
+
+            values = list(zip(center.real.tolist(), center.imag.tolist()))
+            group.append_animation(AnimateTransform('translate', dur=duration, repeatCount='indefinite', values=values))
+            group.append_animation(__rotation(harmonics, i, animation_attr='additive="sum"'))
+            yield group
+
+        # the pen moves along the tip trajectory, keyPoints are fractions of its length
+        tip = next(positions)
+        trajectory = Path.polyline(tip, id=prefix + 'trajectory')
+        distances = np.concatenate(([0.0], np.cumsum(np.abs(np.diff(tip)))))
+        key_points = (distances / distances[-1]).tolist() if distances[-1] > 0 else [0.0] * len(distances)
+        c = Circle(svg.width / 200, 0, 0, presentation_attr='stroke="black" fill="red"')
+        c.append_animation(AnimateMotion(trajectory, dur=duration, repeatCount='indefinite',
+                                         keyPoints=key_points, keyTimes=times.tolist(), calcMode='linear'))
+        yield c
+
+    return LazyGroup(circles, id=prefix + 'epicycles')
+
+
+def __rotation(harmonics: Dict[int, complex], f: int, animation_attr: str = None) -> AnimateTransform:
+    """
+    Turns the circle and arrow of frequency f once per period of f, starting at the phase of its coefficient
+    The turn is given with by instead of to, so it stays exactly 360 degrees however the start angle is rounded
+    :param harmonics: calculated fourier coefficients
+    :param f: frequency of the circle, negative frequencies turn the other way
+    :param animation_attr: further attributes of the animation
+    :return: rotate animation
+    """
+    phase = math.degrees(cmath.phase(harmonics[f]))
+    return AnimateTransform('rotate', dur=1 / abs(f) * duration, from_=(phase, 0, 0),
+                            by='360 0 0' if f < 0 else '-360 0 0', repeatCount='indefinite',
+                            animation_attr=animation_attr)
+
+
+def __motion(harmonics: Dict[int, complex], f: int, circle: Union[Path, str]) -> AnimateMotion:
+    """
+    Moves the next group along the circle of frequency f, in step with the arrow turned by __rotation
+    The circle path starts at its leftmost point, so the motion starts at the fraction of the circle the phase points
+    to, runs to the end and continues from the start
+    :param harmonics: calculated fourier coefficients
+    :param f: frequency of the circle
+    :param circle: path of the circle as created by __circle_to_path, or its id if it is written elsewhere
+    :return: motion animation
+    """
+    if f < 0:
+        start = ((cmath.phase(harmonics[f]) / (2 * cmath.pi)) + 0.5) % 1.0
+    else:
+        start = ((-cmath.phase(harmonics[f]) / (2 * cmath.pi)) + 0.5) % 1.0
+    return AnimateMotion(circle, dur=1 / abs(f) * duration, repeatCount='indefinite', keyPoints=[start, 1, 0, start],
+                         keyTimes=[0, 1 - start, 1 - start, 1], calcMode='linear')
+
+
+def __circle_to_path(x:float, y:float, r:float, direction=0, presentation_attr=None) -> Path:
+    """
+    Creates a circle in form of a path
+    @param x: x coordinate of center
+    @param y: y coordinate of center
+    @param r: radius
+    @param direction: direction in witch to draw
+    @param presentation_attr: svg drawing attributes
+    @return:
+    """
+    p = Path(presentation_attr=presentation_attr)
+    p.M(x - r, y)
+    p.a(r, r, 0, 1, direction, 2 * r, 0)
+    p.a(r, r, 0, 1, direction, -2 * r, 0)
+    return p
@@ -0,0 +1,1291 @@
+import itertools
+import weakref
+
+from abc import abstractmethod, ABC
+
+
+########################################################################################################################
+# number formatting
+########################################################################################################################
+
+class NumberFormat:
+    __slots__ = ('digits', 'decimals', '__format')
+
+    def __init__(self, digits=None, decimals=None):
+        """
+        Formats the numbers written to the svg output
+        @param digits: number of significant digits, None for the shortest exact representation
+        @param decimals: number of decimal places, used if digits is None
+        """
+        if digits is not None and digits < 1:
+            raise ValueError('digits must be at least 1, got ' + str(digits))
+        if decimals is not None and decimals < 0:
+            raise ValueError('decimals must not be negative, got ' + str(decimals))
+        self.digits = digits
+        self.decimals = decimals
+        if digits is not None:
+            self.__format = self.__significant
+        elif decimals is not None:
+            self.__format = self.__fixed
+        else:
+            self.__format = str
+
+    def __call__(self, value):
+        if isinstance(value, str):
+            return value
+        return self.__format(value)
+
+    def many(self, values: list) -> list:
+        """
+        Formats a list of floats with a single string operation instead of one call per number
+        @param values: floats, e.g. a flattened coordinate array as list
+        @return: list of the formatted numbers
+        """
+        if len(values) == 0:
+            return []
+        if self.digits is not None:
+            template = '%%.%dg' % self.digits
+        elif self.decimals is not None:
+            template = '%%.%df' % self.decimals
+        else:
+            return list(map(str, values))
+        formatted = ('\n'.join([template] * len(values)) % tuple(values)).split('\n')
+        if self.digits is None:
+            formatted = [x.rstrip('0').rstrip('.') if '.' in x else x for x in formatted]
+        return ['0' if x == '-0' else x for x in formatted]
+
+    def __significant(self, value):
+        formatted = '%.*g' % (self.digits, value)
+        return '0' if formatted == '-0' else formatted
+
+    def __fixed(self, value):
+        formatted = '%.*f' % (self.decimals, value)
+        if '.' in formatted:
+            formatted = formatted.rstrip('0').rstrip('.')
+        return '0' if formatted == '-0' else formatted
+
+
+########################################################################################################################
+# svg structural classes
+#
+# elements keep the numbers they are given, the visitor formats them when the tree is serialized
+########################################################################################################################
+
+# --- Svg --------------------------------------------------------------------------------------------------------------
+class Svg:
+    __slots__ = ('width', 'height', 'options', 'elements')
+
+    def __init__(self, width, height, options=None):
+        self.width = width
+        self.height = height
+        self.options = str(
+            options) if options is not None else 'xmlns="http://www.w3.org/2000/svg" ' \
+                                                 'xmlns:xlink="http://www.w3.org/1999/xlink" '
+        self.elements = []
+
+    def append(self, elem):
+        self.elements.append(elem)
+
+    def accept(self, visitor):
+        visitor.visit_svg(self)
+
+
+########################################################################################################################
+# Shapes
+
+# --- Shape - abstract -------------------------------------------------------------------------------------------------
+class Shape(ABC):
+    __slots__ = ('id', 'presentation_attr', 'animations', '__weakref__')
+
+    def __init__(self, id=None, presentation_attr=None):
+        self.id = str(id) if id is not None else None
+        self.presentation_attr = str(presentation_attr) if presentation_attr is not None else None
+        self.animations = []
+
+    def append_animation(self, animation):
+        self.animations.append(animation)
+
+    def accept(self, visitor):
+        visitor.visit_shape(self)
+
+
+# --- Rectangle --------------------------------------------------------------------------------------------------------
+class Rectangle(Shape):
+    __slots__ = ('width', 'height', 'x', 'y', 'rx', 'ry')
+
+    def __init__(self, width, height, x=None, y=None, rx=None, ry=None, id=None, presentation_attr=None):
+        super().__init__(id=id, presentation_attr=presentation_attr)
+        self.width = width
+        self.height = height
+        self.x = x
+        self.y = y
+        self.rx = rx
+        self.ry = ry
+
+    def accept(self, visitor):
+        visitor.visit_rectangle(self)
+
+
+# --- Circle -----------------------------------------------------------------------------------------------------------
+class Circle(Shape):
+    __slots__ = ('r', 'cx', 'cy')
+
+    def __init__(self, r, cx=None, cy=None, id=None, presentation_attr=None):
+        super().__init__(id=id, presentation_attr=presentation_attr)
+        self.r = r
+        self.cx = cx
+        self.cy = cy
+
+    def accept(self, visitor):
+        visitor.visit_circle(self)
+
+
+# --- Ellipse ----------------------------------------------------------------------------------------------------------
+class Ellipse(Shape):
+    __slots__ = ('rx', 'ry', 'cx', 'cy')
+
+    def __init__(self, rx, ry, cx=None, cy=None, id=None, presentation_attr=None):
+        super().__init__(id=id, presentation_attr=presentation_attr)
+        self.rx = rx
+        self.ry = ry
+        self.cx = cx
+        self.cy = cy
+
+    def accept(self, visitor):
+        visitor.visit_ellipse(self)
+
+
+# --- Line -------------------------------------------------------------------------------------------------------------
+class Line(Shape):
+    __slots__ = ('x1', 'y1', 'x2', 'y2')
+
+    def __init__(self, x1, y1, x2, y2, id=None, presentation_attr=None):
+        super().__init__(id=id, presentation_attr=presentation_attr)
+        self.x1 = x1
+        self.y1 = y1
+        self.x2 = x2
+        self.y2 = y2
+
+    def accept(self, visitor):
+        visitor.visit_line(self)
+
+
+# --- Polygon ----------------------------------------------------------------------------------------------------------
+class Polygon(Shape):
+    __slots__ = ('points',)
+
+    def __init__(self, id=None, presentation_attr=None):
+        super().__init__(id=id, presentation_attr=presentation_attr)
+        self.points = []
+
+    def add_point(self, x, y):
+        self.points.append((x, y))
+
+    def format_points(self, number_format=str):
+        return ' points="' + ' '.join(number_format(x) + ',' + number_format(y) for (x, y) in self.points) + '"'
+
+    def accept(self, visitor):
+        visitor.visit_polygon(self)
+
+
+# --- Polyline ---------------------------------------------------------------------------------------------------------
+class Polyline(Shape):
+    __slots__ = ('points',)
+
+    def __init__(self, id=None, presentation_attr=None):
+        super().__init__(id=id, presentation_attr=presentation_attr)
+        self.points = []
+
+    def add_point(self, x, y):
+        self.points.append((x, y))
+
+    def format_points(self, number_format=str):
+        return ' points="' + " ".join(number_format(x) + ',' + number_format(y) for x, y in self.points) + '"'
+
+    def accept(self, visitor):
+        visitor.visit_polyline(self)
+
+
+# --- Path -------------------------------------------------------------------------------------------------------------
+class _Coordinates:
+    __slots__ = ('first', 'command', 'per_command', 'values')
+
+    def __init__(self, first, command, per_command, values):
+        """
+        Run of path commands created from a coordinate array, formatted in one step on output
+        @param first: command letter of the first point, e.g. 'M'
+        @param command: command letter of every following group of points, e.g. 'L' or 'C'
+        @param per_command: number of points per following command
+        @param values: flat list x0, y0, x1, y1, ... of all points
+        """
+        self.first = first
+        self.command = command
+        self.per_command = per_command
+        self.values = values
+
+    def format(self, number_format):
+        numbers = number_format.many(self.values) if isinstance(number_format, NumberFormat) \
+            else list(map(number_format, self.values))
+        points = list(map(' '.join, zip(numbers[0::2], numbers[1::2])))
+        n = self.per_command
+        commands = [self.first + ' ' + points[0]]
+        commands.extend(self.command + ' ' + ' '.join(points[i:i + n]) for i in range(1, len(points), n))
+        return ' '.join(commands)
+
+
+def _flat_coordinates(points) -> list:
+    """
+    Flattens a complex array of n points or a real array of shape (n, 2) to the list x0, y0, x1, y1, ...
+    """
+    import numpy as np
+
+    points = np.asarray(points)
+    if np.iscomplexobj(points):
+        points = np.stack((points.real, points.imag), axis=-1)
+    if points.ndim != 2 or points.shape[1] != 2:
+        raise ValueError('expected complex points or an array of shape (n, 2), got shape ' + str(points.shape))
+    return points.astype(float).ravel().tolist()
+
+
+class Path(Shape):
+    __slots__ = ('commands',)
+
+    def __init__(self, id=None, presentation_attr=None):
+        super().__init__(id=id, presentation_attr=presentation_attr)
+        # tuples of a command letter and its numbers, or preformatted path strings
+        self.commands = []
+
+    def M(self, x, y):
+        self.commands.append(('M', x, y))
+
+    def m(self, dx, dy):
+        self.commands.append(('m', dx, dy))
+
+    def L(self, x, y):
+        self.commands.append(('L', x, y))
+
+    def l(self, dx, dy):
+        self.commands.append(('l', dx, dy))
+
+    def H(self, x):
+        self.commands.append(('H', x))
+
+    def h(self, dx):
+        self.commands.append(('h', dx))
+
+    def V(self, y):
+        self.commands.append(('V', y))
+
+    def v(self, dy):
+        self.commands.append(('v', dy))
+
+    def Z(self):
+        self.commands.append(('Z',))
+
+    def C(self, cx1, cy1, cx2, cy2, ex, ey):
+        self.commands.append(('C', cx1, cy1, cx2, cy2, ex, ey))
+
+    def c(self, cx1, cy1, cx2, cy2, ex, ey):
+        self.commands.append(('c', cx1, cy1, cx2, cy2, ex, ey))
+
+    def S(self, cx2, cy2, ex, ey):
+        self.commands.append(('S', cx2, cy2, ex, ey))
+
+    def s(self, cx2, cy2, ex, ey):
+        self.commands.append(('s', cx2, cy2, ex, ey))
+
+    def Q(self, cx, cy, ex, ey):
+        self.commands.append(('Q', cx, cy, ex, ey))
+
+    def q(self, cx, cy, ex, ey):
+        self.commands.append(('q', cx, cy, ex, ey))
+
+    def T(self, ex, ey):
+        self.commands.append(('T', ex, ey))
+
+    def t(self, ex, ey):
+        self.commands.append(('t', ex, ey))
+
+    def A(self, rx, ry, rot, largeArc, sweep, ex, ey):
+        self.commands.append(('A', rx, ry, rot, str(int(bool(largeArc))), str(int(bool(sweep))), ex, ey))
+
+    def a(self, rx, ry, rot, largeArc, sweep, ex, ey):
+        self.commands.append(('a', rx, ry, rot, str(int(bool(largeArc))), str(int(bool(sweep))), ex, ey))
+
+    def set_path(self, path_string):
+        self.commands = [path_string]
+
+    @classmethod
+    def polyline(cls, points, id=None, presentation_attr=None):
+        """
+        Creates a path moving to the first point and drawing lines through the others
+        @param points: complex array of n points or real array of shape (n, 2), n >= 1
+        """
+        values = _flat_coordinates(points)
+        if len(values) == 0:
+            raise ValueError('a polyline needs at least one point')
+        path = cls(id=id, presentation_attr=presentation_attr)
+        path.commands.append(_Coordinates('M', 'L', 1, values))
+        return path
+
+    @classmethod
+    def cubic_spline(cls, ctrl, id=None, presentation_attr=None):
+        """
+        Creates a path of consecutive cubic beziers
+        @param ctrl: complex array or real array of shape (3 * n + 1, 2): the start point followed by the two control
+                     points and the end point of every bezier
+        """
+        values = _flat_coordinates(ctrl)
+        if len(values) == 0 or (len(values) // 2 - 1) % 3 != 0:
+            raise ValueError('a cubic spline needs 3 * n + 1 points, got ' + str(len(values) // 2))
+        path = cls(id=id, presentation_attr=presentation_attr)
+        path.commands.append(_Coordinates('M', 'C', 3, values))
+        return path
+
+    def format_commands(self, number_format=str):
+        """
+        Joins the commands into the value of the d attribute, None if there are none
+        """
+        if len(self.commands) == 0:
+            return None
+        return ' '.join(self.__format_command(command, number_format) for command in self.commands)
+
+    @staticmethod
+    def __format_command(command, number_format):
+        if isinstance(command, str):
+            return command
+        if isinstance(command, _Coordinates):
+            return command.format(number_format)
+        return ' '.join(map(number_format, command))
+
+    @property
+    def d(self):
+        return self.format_commands()
+
+    def accept(self, visitor):
+        visitor.visit_path(self)
+
+
+# --- Text -------------------------------------------------------------------------------------------------------------
+class Text(Shape):
+    __slots__ = ('text', 'xs', 'ys', 'dxs', 'dys', 'textLength', 'rotates')
+
+    def __init__(self, text, xs: list = None, ys: list = None, dxs: list = None, dys: list = None, textLength=None,
+                 rotates: list = None, id=None, presentation_attr=None):
+        super().__init__(id=id, presentation_attr=presentation_attr)
+        self.text = text
+        self.textLength = textLength
+        self.xs = xs
+        self.ys = ys
+        self.dxs = dxs
+        self.dys = dys
+        self.rotates = rotates
+
+    def accept(self, visitor):
+        visitor.visit_text(self)
+
+
+# --- Use --------------------------------------------------------------------------------------------------------------
+class Use(Shape):
+    __slots__ = ('element', 'x', 'y', 'transform')
+
+    def __init__(self, element: Shape, x=None, y=None, transform=None, id=None, presentation_attr=None):
+        """
+        Instance of another element, the element is written once to the definitions if it is not rendered anyway
+        @param element: referenced element
+        @param transform: string or tuple of the transform function and its numbers, e.g. ('scale', r)
+        """
+        super().__init__(id=id, presentation_attr=presentation_attr)
+        self.element = element
+        self.x = x
+        self.y = y
+        self.transform = transform
+
+    def accept(self, visitor):
+        visitor.visit_use(self)
+
+
+########################################################################################################################
+# Animations
+
+# --- Animation - abstract ---------------------------------------------------------------------------------------------
+class Animation(ABC):
+    __slots__ = ('dur', 'repeatCount', 'animation_attr')
+
+    def __init__(self, dur=None, repeatCount=None, animation_attr=None):
+        """
+        @param dur: clock value or number of seconds
+        """
+        self.dur = dur
+        self.repeatCount = repeatCount
+        self.animation_attr = str(animation_attr) if animation_attr is not None else None
+
+    def accept(self, visitor):
+        visitor.visit_animation(self)
+
+
+# --- Animate ----------------------------------------------------------------------------------------------------------
+class Animate(Animation):
+    __slots__ = ('attribute_name', 'by', 'from_', 'to', 'values')
+
+    def __init__(self, attribute_name, by=None, from_=None, to=None, dur=None, repeatCount=None, animation_attr=None,
+                 values: list = None):
+        super().__init__(dur, repeatCount, animation_attr)
+        self.attribute_name = str(attribute_name)
+        self.by = by
+        self.from_ = from_
+        self.to = to
+        self.values = values
+
+    def accept(self, visitor):
+        visitor.visit_animate(self)
+
+
+# --- AnimateMotion ----------------------------------------------------------------------------------------------------
+class AnimateMotion(Animation):
+    __slots__ = ('path', 'keyPoints', 'keyTimes', 'calcMode')
+
+    def __init__(self, path: Path, keyPoints: list = None, keyTimes: list = None, calcMode=None, dur=None,
+                 repeatCount=None,
+                 animation_attr=None):
+        """
+        @param path: path to move along, or the id of a path that is written elsewhere in the document
+        """
+        super().__init__(dur, repeatCount, animation_attr)
+        self.path = path
+        self.calcMode = str(calcMode) if calcMode is not None else None
+        self.keyPoints = keyPoints
+        self.keyTimes = keyTimes
+
+    def accept(self, visitor):
+        visitor.visit_animate_motion(self)
+
+
+# --- AnimateTransform -------------------------------------------------------------------------------------------------
+class AnimateTransform(Animation):
+    __slots__ = ('type', 'by', 'from_', 'to', 'values')
+
+    def __init__(self, type, by=None, from_=None, to=None, dur=None, repeatCount=None, animation_attr=None,
+                 values: list = None):
+        """
+        @param by: number, sequence of numbers or string, the same applies to from_ and to
+        @param values: list of numbers or of sequences of numbers, one entry per keyframe
+        """
+        super().__init__(dur, repeatCount, animation_attr)
+        self.type = str(type) if type is not None else None
+        self.by = by
+        self.from_ = from_
+        self.to = to
+        self.values = values
+
+    def accept(self, visitor):
+        visitor.visit_animate_transform(self)
+
+
+########################################################################################################################
+# Group
+
+class Group:
+    __slots__ = ('id', 'presentation_attr', 'transform', 'elements', 'animations')
+
+    def __init__(self, id=None, presentation_attr=None, transform=None):
+        """
+        @param transform: string or tuple of the transform function and its numbers, e.g. ('translate', x, y)
+        """
+        self.id = str(id) if id is not None else None
+        self.presentation_attr = str(presentation_attr) if presentation_attr is not None else None
+        self.transform = transform
+        self.elements = []
+        self.animations = []
+
+    def append_element(self, element):
+        self.elements.append(element)
+
+    def append_animation(self, animation):
+        self.animations.append(animation)
+
+    def accept(self, visitor):
+        visitor.visit_group(self)
+
+    def accept_enter(self, visitor):
+        visitor.enter_group(self)
+
+    def accept_exit(self, visitor):
+        visitor.exit_group(self)
+
+    def children(self):
+        return self.elements + self.animations
+
+
+class LazyGroup(Group):
+    __slots__ = ('content',)
+
+    def __init__(self, content, id=None, presentation_attr=None, transform=None):
+        """
+        Group whose children are only created while a visitor is inside it, after the appended ones
+        A visitor writing to a file then holds the open groups instead of the whole tree
+        @param content: called without arguments every time the group is visited, returns an iterable of children
+        """
+        super().__init__(id=id, presentation_attr=presentation_attr, transform=transform)
+        self.content = content
+
+    def children(self):
+        return itertools.chain(self.elements, self.animations, self.content())
+
+
+########################################################################################################################
+# visitors
+########################################################################################################################
+
+class Visitor(ABC):
+    def traverse(self, elements):
+        """
+        Visits elements and everything below them depth first
+        Groups are not visited recursively but entered and exited with an explicit stack, so deeply nested trees
+        neither hit the recursion limit nor grow the call stack. Children are taken from their iterator one ahead,
+        a group whose last child is entered keeps only the group itself on the stack, not its iterator
+        @param elements: iterable of the elements to visit in order
+        """
+        end = object()
+        # the open groups with the iterator and the next one of their remaining children
+        stack = []
+        group, children = None, iter(elements)
+        pending = next(children, end)
+        while True:
+            if pending is end:
+                if group is not None:
+                    group.accept_exit(self)
+                if len(stack) == 0:
+                    return
+                group, children, pending = stack.pop()
+                continue
+
+            elem, pending = pending, next(children, end)
+            if isinstance(elem, Group):
+                elem.accept_enter(self)
+                stack.append((group, children if pending is not end else None, pending))
+                group, children = elem, iter(elem.children())
+                pending = next(children, end)
+            else:
+                elem.accept(self)
+
+    @abstractmethod
+    def visit_svg(self, svg: Svg):
+        pass
+
+    @abstractmethod
+    def visit_shape(self, shape: Shape):
+        pass
+
+    @abstractmethod
+    def visit_rectangle(self, rect: Rectangle):
+        pass
+
+    @abstractmethod
+    def visit_circle(self, circ: Circle):
+        pass
+
+    @abstractmethod
+    def visit_ellipse(self, ellip: Ellipse):
+        pass
+
+    @abstractmethod
+    def visit_line(self, line: Line):
+        pass
+
+    @abstractmethod
+    def visit_polygon(self, polygon: Polygon):
+        pass
+
+    @abstractmethod
+    def visit_polyline(self, polyline: Polyline):
+        pass
+
+    @abstractmethod
+    def visit_path(self, path: Path):
+        pass
+
+    @abstractmethod
+    def visit_text(self, text: Text):
+        pass
+
+    @abstractmethod
+    def visit_use(self, use: Use):
+        pass
+
+    @abstractmethod
+    def visit_animation(self, animation: Animation):
+        pass
+
+    @abstractmethod
+    def visit_animate(self, animate: Animate):
+        pass
+
+    @abstractmethod
+    def visit_animate_motion(self, motion: AnimateMotion):
+        pass
+
+    @abstractmethod
+    def visit_animate_transform(self, transform: AnimateTransform):
+        pass
+
+    @abstractmethod
+    def visit_group(self, group: Group):
+        pass
+
+    @abstractmethod
+    def enter_group(self, group: Group):
+        pass
+
+    @abstractmethod
+    def exit_group(self, group: Group):
+        pass
+
+
+class _StreamWriter:
+    """
+    Stands in for a chunk list and writes every appended chunk straight to a file object
+    """
+
+    def __init__(self, fd):
+        self.fd = fd
+        self.size = 0
+
+    def append(self, chunk):
+        self.fd.write(chunk)
+        self.size += len(chunk)
+
+    def __iter__(self):
+        return iter(())
+
+
+# noinspection PyShadowingNames
+class FormatVisitor(Visitor):
+    def __init__(self, out=None, number_format: NumberFormat = None):
+        """
+        @param out: optional file object, if given the output is written to it while the tree is visited instead of
+                    being collected in memory. Definitions that are not rendered anyway are then written after the
+                    elements instead of before them
+        @param number_format: format of the numbers of the elements, full precision by default. Durations, key
+                              times and key points are always written with full precision
+        """
+        self.out = out
+        self.number_format = number_format if number_format is not None else NumberFormat()
+        if out is None:
+            self.header_str = []
+            self.elements_str = []
+            self.footer_str = []
+        else:
+            self.header_str = self.elements_str = self.footer_str = _StreamWriter(out)
+        self.defs_str = []
+
+        self.indent = 0
+
+        self.element_count = 0
+        self.id_counter = 0
+        # rendered shapes, and referenced shapes that were not rendered yet keyed by object identity
+        self.elements = weakref.WeakSet()
+        self.defs = {}
+
+    def visit_svg(self, svg: Svg):
+        self.element_count += 1
+        self.__indent(self.header_str)
+        self.header_str.append('<svg')
+
+        self.header_str.append(' width="')
+        self.header_str.append(self.number_format(svg.width))
+        self.header_str.append('"')
+
+        self.header_str.append(' height="')
+        self.header_str.append(self.number_format(svg.height))
+        self.header_str.append('"')
+
+        if svg.options is not None:
+            self.header_str.append(' ' + svg.options)
+
+        self.header_str.append('>')
+        self.header_str.append('\n')
+
+        self.indent += 1
+        self.traverse(svg.elements)
+        self.indent -= 1
+
+        pending = list(self.defs.values())
+        if len(pending) != 0:
+            tmp = self.elements_str
+            self.elements_str = []
+
+            self.__indent(self.elements_str)
+            self.elements_str.append('<defs>')
+            self.indent += 1
+            while len(pending) != 0:
+                for def_ in pending:
+                    def_.accept(self)
+                # definitions can reference further definitions through their own animations
+                pending = list(self.defs.values())
+            self.indent -= 1
+            self.__indent(self.elements_str)
+            self.elements_str.append('</defs>\n')
+
+            if self.out is None:
+                self.defs_str = self.elements_str
+            else:
+                for chunk in self.elements_str:
+                    tmp.append(chunk)
+            self.elements_str = tmp
+
+        self.__indent(self.footer_str)
+        self.footer_str.append('</svg>')
+
+    def visit_shape(self, shape: Shape):
+        self.element_count += 1
+        if shape.id is None:
+            shape.id = 'e' + str(self.id_counter)
+            self.id_counter += 1
+        self.elements_str.append(' id="')
+        self.elements_str.append(shape.id)
+        self.elements_str.append('"')
+        self.elements.add(shape)
+        self.defs.pop(id(shape), None)
+
+        if shape.presentation_attr is not None:
+            self.elements_str.append(' ' + shape.presentation_attr)
+
+        self.elements_str.append('>')
+        self.elements_str.append('\n')
+
+        self.indent += 1
+        for animation in shape.animations:
+            animation.accept(self)
+        self.indent -= 1
+
+    def visit_rectangle(self, rect: Rectangle):
+        self.__indent(self.elements_str)
+        self.elements_str.append('<rect')
+
+        self.elements_str.append(' width="')
+        self.elements_str.append(self.number_format(rect.width))
+        self.elements_str.append('"')
+
+        self.elements_str.append(' height="')
+        self.elements_str.append(self.number_format(rect.height))
+        self.elements_str.append('"')
+
+        if rect.x is not None:
+            self.elements_str.append(' x="')
+            self.elements_str.append(self.number_format(rect.x))
+            self.elements_str.append('"')
+
+        if rect.y is not None:
+            self.elements_str.append(' y="')
+            self.elements_str.append(self.number_format(rect.y))
+            self.elements_str.append('"')
+
+        if rect.rx is not None:
+            self.elements_str.append(' rx="')
+            self.elements_str.append(self.number_format(rect.rx))
+            self.elements_str.append('"')
+
+        if rect.ry is not None:
+            self.elements_str.append(' ry="')
+            self.elements_str.append(self.number_format(rect.ry))
+            self.elements_str.append('"')
+
+        super(Rectangle, rect).accept(self)
+
+        self.__indent(self.elements_str)
+        self.elements_str.append('</rect>')
+        self.elements_str.append('\n')
+
+    def visit_circle(self, circle: Circle):
+        self.__indent(self.elements_str)
+        self.elements_str.append('<circle')
+
+        self.elements_str.append(' r="')
+        self.elements_str.append(self.number_format(circle.r))
+        self.elements_str.append('"')
+
+        if circle.cx is not None:
+            self.elements_str.append(' cx="')
+            self.elements_str.append(self.number_format(circle.cx))
+            self.elements_str.append('"')
+
+        if circle.cy is not None:
+            self.elements_str.append(' cy="')
+            self.elements_str.append(self.number_format(circle.cy))
+            self.elements_str.append('"')
+
+        super(Circle, circle).accept(self)
+
+        self.__indent(self.elements_str)
+        self.elements_str.append('</circle>')
+        self.elements_str.append('\n')
+
+    def visit_ellipse(self, ellip: Ellipse):
+        self.__indent(self.elements_str)
+        self.elements_str.append('<ellipse')
+
+        self.elements_str.append(' rx="')
+        self.elements_str.append(self.number_format(ellip.rx))
+        self.elements_str.append('"')
+
+        self.elements_str.append(' ry="')
+        self.elements_str.append(self.number_format(ellip.ry))
+        self.elements_str.append('"')
+
+        if ellip.cx is not None:
+            self.elements_str.append(' cx="')
+            self.elements_str.append(self.number_format(ellip.cx))
+            self.elements_str.append('"')
+
+        if ellip.cy is not None:
+            self.elements_str.append(' cy="')
+            self.elements_str.append(self.number_format(ellip.cy))
+            self.elements_str.append('"')
+
+        super(Ellipse, ellip).accept(self)
+
+        self.__indent(self.elements_str)
+        self.elements_str.append('</ellipse>')
+        self.elements_str.append('\n')
+
+    def visit_line(self, line: Line):
+        self.__indent(self.elements_str)
+        self.elements_str.append('<line')
+
+        self.elements_str.append(' x1="')
+        self.elements_str.append(self.number_format(line.x1))
+        self.elements_str.append('"')
+
+        self.elements_str.append(' y1="')
+        self.elements_str.append(self.number_format(line.y1))
+        self.elements_str.append('"')
+
+        self.elements_str.append(' x2="')
+        self.elements_str.append(self.number_format(line.x2))
+        self.elements_str.append('"')
+
+        self.elements_str.append(' y2="')
+        self.elements_str.append(self.number_format(line.y2))
+        self.elements_str.append('"')
+
+        super(Line, line).accept(self)
+
+        self.__indent(self.elements_str)
+        self.elements_str.append('</line>')
+        self.elements_str.append('\n')
+
+    def visit_polygon(self, polygon: Polygon):
+        self.__indent(self.elements_str)
+        self.elements_str.append('<polygon')
+
+        self.elements_str.append(polygon.format_points(self.number_format))
+
+        super(Polygon, polygon).accept(self)
+
+        self.__indent(self.elements_str)
+        self.elements_str.append('</polygon>')
+        self.elements_str.append('\n')
+
+    def visit_polyline(self, polyline: Polyline):
+        self.__indent(self.elements_str)
+        self.elements_str.append('<polyline')
+
+        self.elements_str.append(polyline.format_points(self.number_format))
+
+        super(Polyline, polyline).accept(self)
+
+        self.__indent(self.elements_str)
+        self.elements_str.append('</polyline>')
+        self.elements_str.append('\n')
+
+    def visit_path(self, path: Path):
+        self.__indent(self.elements_str)
+        self.elements_str.append('<path')
+
+        d = path.format_commands(self.number_format)
+        if d is not None:
+            self.elements_str.append(' d="' + d + '"')
+
+        super(Path, path).accept(self)
+
+        self.__indent(self.elements_str)
+        self.elements_str.append('</path>')
+        self.elements_str.append('\n')
+
+    def visit_text(self, text: Text):
+        self.__indent(self.elements_str)
+        self.elements_str.append('<text')
+
+        if text.textLength is not None:
+            self.elements_str.append(' textLength="')
+            self.elements_str.append(self.number_format(text.textLength))
+            self.elements_str.append('"')
+
+        if text.xs is not None:
+            self.elements_str.append(' x="')
+            self.elements_str.append(', '.join(map(self.number_format, text.xs)))
+            self.elements_str.append('"')
+
+        if text.ys is not None:
+            self.elements_str.append(' y="')
+            self.elements_str.append(', '.join(map(self.number_format, text.ys)))
+            self.elements_str.append('"')
+
+        if text.dxs is not None:
+            self.elements_str.append(' dx="')
+            self.elements_str.append(', '.join(map(self.number_format, text.dxs)))
+            self.elements_str.append('"')
+
+        if text.dys is not None:
+            self.elements_str.append(' dy="')
+            self.elements_str.append(', '.join(map(self.number_format, text.dys)))
+            self.elements_str.append('"')
+
+        if text.rotates is not None:
+            self.elements_str.append(' rotate="')
+            self.elements_str.append(', '.join(map(self.number_format, text.rotates)))
+            self.elements_str.append('"')
+
+        super(Text, text).accept(self)
+
+        self.indent += 1
+        self.__indent(self.elements_str)
+        self.indent -= 1
+        self.elements_str.append(text.text)
+        self.elements_str.append('\n')
+
+        self.__indent(self.elements_str)
+        self.elements_str.append('</text>')
+        self.elements_str.append('\n')
+
+    def visit_use(self, use: Use):
+        self.__indent(self.elements_str)
+        self.elements_str.append('<use xlink:href="#')
+        self.elements_str.append(self.__reference(use.element))
+        self.elements_str.append('"')
+
+        if use.x is not None:
+            self.elements_str.append(' x="')
+            self.elements_str.append(self.number_format(use.x))
+            self.elements_str.append('"')
+
+        if use.y is not None:
+            self.elements_str.append(' y="')
+            self.elements_str.append(self.number_format(use.y))
+            self.elements_str.append('"')
+
+        if use.transform is not None:
+            self.elements_str.append(' transform="')
+            self.elements_str.append(self.__transform(use.transform))
+            self.elements_str.append('"')
+
+        super(Use, use).accept(self)
+
+        self.__indent(self.elements_str)
+        self.elements_str.append('</use>')
+        self.elements_str.append('\n')
+
+    def visit_animation(self, animation: Animation):
+        self.element_count += 1
+        # timing is never rounded, animations that have to stay in step would drift apart
+        if animation.dur is not None:
+            self.elements_str.append(' dur="')
+            self.elements_str.append(animation.dur if isinstance(animation.dur, str) else str(animation.dur) + 's')
+            self.elements_str.append('"')
+
+        if animation.repeatCount is not None:
+            self.elements_str.append(' repeatCount="')
+            self.elements_str.append(str(animation.repeatCount))
+            self.elements_str.append('"')
+
+        if animation.animation_attr is not None:
+            self.elements_str.append(' ' + animation.animation_attr)
+
+        self.elements_str.append('>')
+        self.elements_str.append('\n')
+
+    def visit_animate(self, animate: Animate):
+        self.__indent(self.elements_str)
+        self.elements_str.append('<animate')
+
+        self.elements_str.append(' attributeName="')
+        self.elements_str.append(animate.attribute_name)
+        self.elements_str.append('"')
+
+        if animate.by is not None:
+            self.elements_str.append(' by="')
+            self.elements_str.append(self.__value(animate.by))
+            self.elements_str.append('"')
+
+        if animate.from_ is not None:
+            self.elements_str.append(' from="')
+            self.elements_str.append(self.__value(animate.from_))
+            self.elements_str.append('"')
+
+        if animate.to is not None:
+            self.elements_str.append(' to="')
+            self.elements_str.append(self.__value(animate.to))
+            self.elements_str.append('"')
+
+        if animate.values is not None:
+            self.elements_str.append(' values="')
+            self.elements_str.append(self.__values(animate.values))
+            self.elements_str.append('"')
+
+        super(Animate, animate).accept(self)
+
+        self.__indent(self.elements_str)
+        self.elements_str.append('</animate>')
+        self.elements_str.append('\n')
+
+    def visit_animate_motion(self, motion: AnimateMotion):
+        self.__indent(self.elements_str)
+        self.elements_str.append('<animateMotion')
+
+        # if motion.path.d is not None:
+        #    self.elements_str.append(' path="')
+        #    self.elements_str.append(motion.path.d)
+        #    self.elements_str.append('"')
+
+        # key points and times are fractions of the path and the duration, rounding them collapses neighbours
+        if motion.keyPoints is not None:
+            self.elements_str.append(' keyPoints="')
+            self.elements_str.append(';'.join(map(str, motion.keyPoints)))
+            self.elements_str.append('"')
+
+        if motion.keyTimes is not None:
+            self.elements_str.append(' keyTimes="')
+            self.elements_str.append(';'.join(map(str, motion.keyTimes)))
+            self.elements_str.append('"')
+
+        if motion.calcMode is not None:
+            self.elements_str.append(' calcMode="')
+            self.elements_str.append(motion.calcMode)
+            self.elements_str.append('"')
+
+        super(AnimateMotion, motion).accept(self)
+
+        self.indent += 1
+        self.__indent(self.elements_str)
+        self.elements_str.append('<mpath xlink:href="#')
+        self.elements_str.append(motion.path if isinstance(motion.path, str) else self.__reference(motion.path))
+        self.elements_str.append('"/>\n')
+        self.indent -= 1
+
+        self.__indent(self.elements_str)
+        self.elements_str.append('</animateMotion>')
+        self.elements_str.append('\n')
+
+    def visit_animate_transform(self, transform: AnimateTransform):
+        self.__indent(self.elements_str)
+        self.elements_str.append('<animateTransform attributeName="transform"')
+
+        self.elements_str.append(' type="')
+        self.elements_str.append(transform.type)
+        self.elements_str.append('"')
+
+        if transform.by is not None:
+            self.elements_str.append(' by="')
+            self.elements_str.append(self.__value(transform.by))
+            self.elements_str.append('"')
+
+        if transform.from_ is not None:
+            self.elements_str.append(' from="')
+            self.elements_str.append(self.__value(transform.from_))
+            self.elements_str.append('"')
+
+        if transform.to is not None:
+            self.elements_str.append(' to="')
+            self.elements_str.append(self.__value(transform.to))
+            self.elements_str.append('"')
+
+        if transform.values is not None:
+            self.elements_str.append(' values="')
+            self.elements_str.append(self.__values(transform.values))
+            self.elements_str.append('"')
+
+        super(AnimateTransform, transform).accept(self)
+
+        self.__indent(self.elements_str)
+        self.elements_str.append('</animateTransform>')
+        self.elements_str.append('\n')
+
+    def visit_group(self, group: Group):
+        self.traverse([group])
+
+    def enter_group(self, group: Group):
+        self.element_count += 1
+        self.__indent(self.elements_str)
+        self.elements_str.append('<g')
+
+        if group.id is not None:
+            self.elements_str.append(' id="')
+            self.elements_str.append(group.id)
+            self.elements_str.append('"')
+
+        if group.transform is not None:
+            self.elements_str.append(' transform="')
+            self.elements_str.append(self.__transform(group.transform))
+            self.elements_str.append('"')
+
+        if group.presentation_attr is not None:
+            self.elements_str.append(' ')
+            self.elements_str.append(group.presentation_attr)
+
+        self.elements_str.append('>\n')
+
+    def exit_group(self, group: Group):
+        self.__indent(self.elements_str)
+        self.elements_str.append('</g>\n')
+
+    def __reference(self, element):
+        """
+        Id of a referenced element, the element is remembered as definition until it is rendered
+        """
+        if element.id is None:
+            element.id = 'e' + str(self.id_counter)
+            self.id_counter += 1
+        if element not in self.elements:
+            self.defs[id(element)] = element
+        return element.id
+
+    def __transform(self, transform):
+        if isinstance(transform, str):
+            return transform
+        return transform[0] + '(' + self.__value(transform[1:]) + ')'
+
+    def __value(self, value):
+        """
+        Formats a number, a sequence of numbers separated by spaces or passes a string through
+        """
+        if isinstance(value, (list, tuple)):
+            return ' '.join(map(self.number_format, value))
+        return self.number_format(value)
+
+    def __values(self, values):
+        """
+        Formats the keyframes of a values attribute
+        """
+        return ';'.join(map(self.__value, values))
+
+    def __indent(self, chunks):
+        if self.indent > 0:
+            chunks.append('\t' * self.indent)
+
+    def chunks(self):
+        """
+        Iterates over the formatted output without joining it
+        """
+        yield from self.header_str
+        yield from self.defs_str
+        yield from self.elements_str
+        yield from self.footer_str
+
+    def write(self, fd):
+        """
+        Writes the formatted output to a file object
+        """
+        fd.writelines(self.chunks())
+
+    def formatted(self):
+        return "".join(self.chunks())
+
+    def size(self):
+        """
+        Number of characters formatted so far, including the ones already written to the file object
+        """
+        if self.out is not None:
+            return self.header_str.size
+        return sum(len(chunk) for chunk in self.chunks())
+
+
+########################################################################################################################
+# test
+########################################################################################################################
+
+#svg = Svg(480.0, 480.0)
+
+# rect = Rectangle(20, 20, 5, 5, presentation_attr='fill="blue"')
+# svg.append(rect)
+
+# circle = Circle(20, 5, 5, presentation_attr='fill="green"')
+# svg.append(circle)
+
+# ellipse = Ellipse(5, 5, 10, 10, presentation_attr='stroke="black" fill="red"')
+# svg.append(ellipse)
+
+# line = Line(3, 3, 5, 7, presentation_attr='stroke="black"')
+# svg.append(line)
+
+# polygon = Polygon(presentation_attr='stroke="black" fill="red"')
+# polygon.add_point(5, 5)
+# polygon.add_point(15, 15)
+# polygon.add_point(5, 50)
+# svg.append(polygon)
+
+# polyline = Polyline(presentation_attr='stroke="black"')
+# polyline.add_point(50, 50)
+# polyline.add_point(75, 15)
+# polyline.add_point(5, 50)
+# svg.append(polyline)
+
+# text = Text("Test", [25, 30], [25, 30])
+# svg.append(text)
+
+#path = Path(presentation_attr='stroke="black" fill="none"')
+#path.m(200.091, 20.094)
+#path.c(-9.325, 0.0, -18.67, 1.19, -27.614, 2.557)
+#path.c(-1.422, 22.928, -5.023, 45.308, -24.034, 53.182)
+#path.c(-19.054, 7.892, -36.952, -5.717, -54.204, -20.966)
+#path.c(-15.084, 11.01, -28.864, 24.3, -39.886, 39.376)
+#path.c(15.309, 17.301, 29.396, 35.09, 21.478, 54.204)
+#path.c(-7.909, 19.094, -30.662, 22.622, -53.694, 24.034)
+#path.c(-1.4, 9.046, -2.045, 18.176, -2.045, 27.614)
+#path.c(0.0, 9.559, 0.612, 18.969, 2.045, 28.124)
+#path.c(23.032, 1.41, 45.784, 3.918, 53.694, 23.012)
+#path.c(7.918, 19.115, -6.168, 37.926, -21.478, 55.228)
+#path.c(10.967, 14.962, 24.91, 27.914, 39.886, 38.864)
+#path.c(17.197, -15.182, 35.218, -28.32, 54.204, -20.454)
+#path.c(19.094, 7.909, 22.622, 30.15, 24.034, 53.182)
+#path.c(8.943, 1.368, 18.288, 2.045, 27.614, 2.045)
+#path.c(9.326, 0.0, 18.159, -0.68, 27.102, -2.045)
+#path.c(1.41, -23.032, 4.941, -45.274, 24.034, -53.182)
+#path.c(18.987, -7.865, 37.008, 5.272, 54.204, 20.454)
+#path.c(14.975, -10.95, 28.918, -23.902, 39.886, -38.864)
+#path.c(-15.309, -17.301, -29.396, -36.112, -21.478, -55.228)
+#path.c(7.909, -19.094, 31.172, -21.6, 54.204, -23.012)
+#path.c(1.434, -9.156, 2.045, -18.566, 2.045, -28.124)
+#path.c(0.0, -9.438, -0.648, -18.567, -2.045, -27.614)
+#path.c(-23.032, -1.41, -46.296, -4.941, -54.204, -24.034)
+#path.c(-7.918, -19.115, 6.168, -36.904, 21.478, -54.204)
+#path.c(-11.022, -15.075, -24.802, -28.366, -39.886, -39.376)
+#path.c(-17.252, 15.249, -35.152, 28.858, -54.204, 20.966)
+#path.c(-19.011, -7.875, -22.612, -30.254, -24.034, -53.182)
+#path.c(-8.943, -1.368, -17.777, -2.557, -27.102, -2.557)
+#path.Z()
+#path.m(0.0, 121.194)
+#path.c(32.522, 0.0, 58.806, 26.284, 58.806, 58.806)
+#path.s(-26.284, 58.806, -58.806, 58.806)
+#path.s(-59.318, -26.284, -59.318, -58.806)
+#path.s(26.796, -58.806, 59.318, -58.806)
+#path.Z()
+
+# animate_tranform = AnimateTransform('rotate', from_='0', to='360', dur='10s', repeatCount='indefinite')
+# path.append_animation(animate_tranform)
+
+#animate_path = Path()
+#animate_motion = AnimateMotion(animate_path, keyPoints=[0, 1], keyTimes=[0, 1], calcMode="linear", dur='1s',
+#                               repeatCount='indefinite')
+#animate_path.m(25, 25)
+#animate_path.l(50, 0)
+#animate_path.l(0, 50)
+#animate_path.l(-50, 0)
+#animate_path.l(0, -50)
+#path.append_animation(animate_motion)
+
+#svg.append(path)
+
+#vis = FormatVisitor()
+#svg.accept(vis)
+#print(vis.formatted())